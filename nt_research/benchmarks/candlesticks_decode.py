@@ -0,0 +1,78 @@
+import glob
+import json
+import sys
+import time
+import polars as pl
+from nt_research.kalshi import decode_candlesticks
+
+
+def decode_candlesticks_dicts(
+    body: bytes, series_ticker: str, ticker: str
+) -> pl.DataFrame:
+    # Previous per-candle dict comprehension, kept for comparison
+    candlesticks = [
+        {
+            "end_period_ts": candlestick["end_period_ts"],
+            "yes_bid_open": candlestick["yes_bid"]["open"],
+            "yes_bid_low": candlestick["yes_bid"]["low"],
+            "yes_bid_high": candlestick["yes_bid"]["high"],
+            "yes_bid_close": candlestick["yes_bid"]["close"],
+            "yes_ask_open": candlestick["yes_ask"]["open"],
+            "yes_ask_low": candlestick["yes_ask"]["low"],
+            "yes_ask_high": candlestick["yes_ask"]["high"],
+            "yes_ask_close": candlestick["yes_ask"]["close"],
+            "volume": candlestick["volume"],
+            "open_interest": candlestick["open_interest"],
+        }
+        for candlestick in json.loads(body)["candlesticks"]
+    ]
+
+    return pl.DataFrame(candlesticks).with_columns(
+        pl.lit(series_ticker).alias("series_ticker"), pl.lit(ticker).alias("ticker")
+    )
+
+
+def make_response(n_candles: int = 1440) -> bytes:
+    # Same shape as a 24h window of 1-minute candles from the API
+    candlesticks = [
+        {
+            "end_period_ts": 1757100000 + 60 * i,
+            "yes_bid": {"open": 50, "low": 48, "high": 52, "close": 51},
+            "yes_ask": {"open": 52, "low": 50, "high": 54, "close": 53},
+            "price": {"open": None, "low": None, "high": None, "close": None},
+            "volume": i % 7,
+            "open_interest": 100 + i,
+        }
+        for i in range(n_candles)
+    ]
+    response = {"ticker": "KXNCAAFGAME-BENCH", "candlesticks": candlesticks}
+    return json.dumps(response).encode()
+
+
+def run_benchmark(bodies: list[bytes], repeats: int = 5) -> None:
+    n_candles = sum(len(json.loads(body)["candlesticks"]) for body in bodies)
+
+    for name, decode in [
+        ("dicts", decode_candlesticks_dicts),
+        ("columnar", decode_candlesticks),
+    ]:
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            for body in bodies:
+                decode(body, "KXNCAAFGAME", "KXNCAAFGAME-BENCH")
+        elapsed = (time.perf_counter() - t0) / repeats
+
+        print(
+            f"{name}: {elapsed * 1000:.1f}ms per pass, "
+            f"{n_candles / elapsed / 1e6:.2f}M candles/s"
+        )
+
+
+if __name__ == "__main__":
+    # Pass a glob of recorded candlestick responses, or use synthetic ones
+    if len(sys.argv) > 1:
+        bodies = [open(path, "rb").read() for path in glob.glob(sys.argv[1])]
+    else:
+        bodies = [make_response() for _ in range(200)]
+
+    run_benchmark(bodies)
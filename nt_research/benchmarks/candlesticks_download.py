@@ -0,0 +1,91 @@
+import datetime as dt
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from nt_research.kalshi import KalshiClient
+
+# Simulated network round trip per request (seconds)
+LATENCY = 0.05
+
+
+class CandlesticksHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        time.sleep(LATENCY)
+
+        params = parse_qs(urlparse(self.path).query)
+        start_ts = int(params["start_ts"][0])
+        end_ts = int(params["end_ts"][0])
+        step = int(params["period_interval"][0]) * 60
+
+        candlesticks = [
+            {
+                "end_period_ts": ts,
+                "yes_bid": {"open": 50, "low": 48, "high": 52, "close": 51},
+                "yes_ask": {"open": 52, "low": 50, "high": 54, "close": 53},
+                "volume": 10,
+                "open_interest": 100,
+            }
+            for ts in range(start_ts + step, end_ts + 1, step)
+        ]
+
+        body = json.dumps({"candlesticks": candlesticks}).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def run_benchmark(n_markets: int = 200, worker_counts: tuple[int, ...] = (1, 4, 8, 16)):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CandlesticksHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = KalshiClient(
+        api_key_id="benchmark",
+        private_key_pem="",
+        base_url=f"http://127.0.0.1:{server.server_port}/",
+        max_requests_per_second=1000,
+    )
+
+    start = dt.datetime(2025, 9, 6, tzinfo=dt.timezone.utc)
+    market_windows = [
+        {
+            "series_ticker": "KXNCAAFGAME",
+            "ticker": f"KXNCAAFGAME-BENCH-{i}",
+            "start_ts": start,
+            "end_ts": start + dt.timedelta(hours=1),
+        }
+        for i in range(n_markets)
+    ]
+
+    baseline = None
+    for max_workers in worker_counts:
+        t0 = time.perf_counter()
+        candlesticks, failures = client.get_markets_candlesticks(
+            market_windows, period_interval=1, max_workers=max_workers
+        )
+        elapsed = time.perf_counter() - t0
+
+        if baseline is None:
+            baseline = candlesticks
+
+        print(
+            f"max_workers={max_workers}: {elapsed:.2f}s, "
+            f"{n_markets / elapsed:.1f} markets/s, "
+            f"failures={len(failures)}, "
+            f"identical={candlesticks.equals(baseline)}"
+        )
+
+    print(client.get_request_stats())
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,68 @@
+import os
+import sys
+import tempfile
+import time
+import polars as pl
+from nt_research.benchmarks.get_trades import make_history
+from nt_research.database import (
+    copy_dataframe,
+    create_table,
+    execute_query,
+    write_dataframe,
+)
+
+TABLE_NAME = "benchmark_candlesticks"
+
+PRIMARY_KEY = ["ticker", "end_period_ts"]
+
+
+def drop_table() -> None:
+    execute_query(f"DROP TABLE IF EXISTS {TABLE_NAME}")
+
+
+def run_benchmark(candlesticks: pl.DataFrame) -> None:
+    # Needs DATABASE_URL pointing at a scratch Postgres, e.g. a local instance
+    writers = [
+        # Previous path, SQLAlchemy inserts into a replaced table
+        ("write_dataframe", lambda: write_dataframe(candlesticks, TABLE_NAME)),
+        ("copy append", lambda: copy_dataframe(candlesticks, TABLE_NAME)),
+        (
+            "copy upsert (new rows)",
+            lambda: copy_dataframe(candlesticks, TABLE_NAME, mode="upsert"),
+        ),
+    ]
+
+    for name, write in writers:
+        drop_table()
+        if name != "write_dataframe":
+            create_table(candlesticks, TABLE_NAME, primary_key=PRIMARY_KEY)
+
+        t0 = time.perf_counter()
+        write()
+        elapsed = time.perf_counter() - t0
+
+        print(
+            f"{name}: {elapsed:.1f}s, "
+            f"{candlesticks.height / elapsed / 1e3:.0f}k rows/s"
+        )
+
+    # Same frame again, every row conflicts and is updated
+    t0 = time.perf_counter()
+    copy_dataframe(candlesticks, TABLE_NAME, mode="upsert")
+    elapsed = time.perf_counter() - t0
+    print(
+        f"copy upsert (all conflicts): {elapsed:.1f}s, "
+        f"{candlesticks.height / elapsed / 1e3:.0f}k rows/s"
+    )
+
+    drop_table()
+
+
+if __name__ == "__main__":
+    n_tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "history.parquet")
+        make_history(source, n_tickers)
+
+        run_benchmark(pl.read_parquet(source))
@@ -0,0 +1,151 @@
+import datetime as dt
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import polars as pl
+import nt_research.research.underdog_risk_premium.data_utils as du
+
+PARAMS = {
+    "min_elapsed_time": -180,
+    "max_elapsed_time": 180,
+    "time_interval": 60,
+    "time_bin": "(-60, 0]",
+}
+
+
+def get_trades_eager(
+    source: str,
+    min_elapsed_time: int,
+    max_elapsed_time: int,
+    time_interval: int,
+    time_bin: str | None = None,
+    price_bin: str | None = None,
+) -> pl.DataFrame:
+    # Previous implementation: full eager read, filter after the group by
+    df = pl.read_parquet(source)
+
+    price_breaks = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 99]
+    time_breaks = np.arange(
+        min_elapsed_time, max_elapsed_time + time_interval, time_interval
+    )
+
+    df = (
+        df.select(
+            "end_period_ts", "ticker", "yes_ask_close", "game_start_time_utc", "result"
+        )
+        .with_columns(
+            pl.col("end_period_ts")
+            .sub(pl.col("game_start_time_utc"))
+            .dt.total_minutes()
+            .alias("elapsed_time"),
+            pl.col("result").replace({"yes": "1", "no": "0"}).cast(pl.Int32),
+        )
+        .filter(
+            pl.col("elapsed_time").is_between(
+                min_elapsed_time, max_elapsed_time, closed="right"
+            )
+        )
+        .with_columns(
+            pl.col("yes_ask_close").cut(price_breaks).cast(pl.String).alias("price_bin"),
+            pl.col("elapsed_time").cut(time_breaks).cast(pl.String).alias("time_bin"),
+        )
+        .sort("ticker", "end_period_ts")
+        .group_by("ticker", "price_bin", "time_bin")
+        .agg(
+            pl.col("elapsed_time").first(),
+            pl.col("yes_ask_close").first(),
+            pl.col("result").first(),
+        )
+        .filter(pl.col("yes_ask_close").is_between(1, 99))
+    )
+
+    if time_bin is not None:
+        df = df.filter(pl.col("time_bin").eq(time_bin))
+
+    if price_bin is not None:
+        df = df.filter(pl.col("price_bin").eq(price_bin))
+
+    return df.sort("ticker", "time_bin", "price_bin")
+
+
+def make_history(path: str, n_tickers: int = 2000) -> None:
+    # 24h of 1-minute candles per ticker around a noon kickoff, plus unused columns
+    rng = np.random.default_rng(0)
+    n_minutes = 24 * 60
+    game_start = dt.datetime(2025, 9, 6, 12, tzinfo=dt.timezone.utc)
+    end_period_ts = pl.datetime_range(
+        game_start - dt.timedelta(hours=12),
+        game_start + dt.timedelta(hours=12) - dt.timedelta(minutes=1),
+        "1m",
+        eager=True,
+        time_zone="UTC",
+    )
+    n = n_tickers * n_minutes
+
+    pl.DataFrame(
+        {
+            "end_period_ts": pl.concat([end_period_ts] * n_tickers),
+            **{
+                f"yes_{side}_{field}": rng.integers(0, 101, n)
+                for side in ["bid", "ask"]
+                for field in ["open", "low", "high", "close"]
+            },
+            "volume": rng.integers(0, 100, n),
+            "open_interest": rng.integers(0, 1000, n),
+            "series_ticker": "KXNCAAFGAME",
+            "ticker": np.repeat([f"T{i}" for i in range(n_tickers)], n_minutes),
+            "game_start_time_utc": game_start,
+            "result": np.repeat(rng.choice(["yes", "no"], n_tickers), n_minutes),
+        }
+    ).write_parquet(path)
+
+
+def run_variant(variant: str, source: str) -> dict:
+    t0 = time.perf_counter()
+    if variant == "eager":
+        trades = get_trades_eager(source, **PARAMS)
+    else:
+        trades = du.get_trades(source=source, use_cache=False, **PARAMS)
+    elapsed = time.perf_counter() - t0
+
+    # ru_maxrss is in KiB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    return {
+        "variant": variant,
+        "seconds": elapsed,
+        "peak_mb": peak_mb,
+        "rows": trades.height,
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        # Child process: one variant per interpreter so peak RSS is not shared
+        print(json.dumps(run_variant(sys.argv[1], sys.argv[2])))
+        sys.exit()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if len(sys.argv) == 2:
+            source = sys.argv[1]
+        else:
+            source = os.path.join(tmp, "history.parquet")
+            make_history(source)
+
+        for variant in ["eager", "lazy"]:
+            output = subprocess.run(
+                [sys.executable, "-m", __spec__.name, variant, source],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{result['variant']}: {result['seconds']:.2f}s, "
+                f"peak {result['peak_mb']:.0f}MB, {result['rows']} trades"
+            )
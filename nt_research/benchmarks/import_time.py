@@ -0,0 +1,35 @@
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = [
+    "nt_research.kalshi",
+    "nt_research.database",
+    "nt_research.datasets.settled_cfb_markets",
+    "nt_research.research.underdog_risk_premium.data_utils",
+    "nt_research.research.underdog_risk_premium.experiment_1",
+    "nt_research.research.underdog_risk_premium.experiment_2",
+    "nt_research.research.underdog_risk_premium.experiment_3",
+    "nt_research.research.underdog_risk_premium.experiment_4",
+]
+
+
+def time_import(module: str, repeats: int = 5) -> float:
+    # Fresh interpreter each run so nothing is already in sys.modules
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+        timings.append(time.perf_counter() - t0)
+
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    baseline = time_import("sys")
+    print(f"{'interpreter startup':<60} {baseline * 1000:8.1f}ms")
+
+    for module in MODULES:
+        elapsed = time_import(module) - baseline
+        print(f"{module:<60} {elapsed * 1000:8.1f}ms")
@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import polars as pl
+from nt_research.rendering import save_tables
+from nt_research.research.underdog_risk_premium.experiment_1 import (
+    get_calibration_table,
+)
+
+
+def make_results(seed: int) -> pl.DataFrame:
+    # Same shape as experiment_1 get_results
+    rng = np.random.default_rng(seed)
+    price_mean = np.arange(10) * 10 + 5 + rng.normal(0, 1, 10)
+    result_mean = price_mean + rng.normal(0, 3, 10)
+
+    return pl.DataFrame(
+        {
+            "price_bin": [f"({i * 10}, {i * 10 + 10}]" for i in range(10)],
+            "trade_time_mean": rng.uniform(-60, 0, 10),
+            "price_mean": price_mean,
+            "result_mean": result_mean,
+            "result_stdev": rng.uniform(10, 50, 10),
+            "count": rng.integers(100, 1000, 10),
+            "delta": result_mean - price_mean,
+            "tstat": rng.normal(0, 2, 10),
+        }
+    )
+
+
+def run_benchmark(n_tables: int = 20, web_driver: str = "chrome") -> None:
+    tables = [
+        get_calibration_table(make_results(i), title=f"Table {i}")
+        for i in range(n_tables)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        modes = [
+            # Previous path, one browser launch per table
+            (
+                "gt.save",
+                lambda: [
+                    gt.save(os.path.join(tmp_dir, f"{i}.png"), web_driver=web_driver)
+                    for i, gt in enumerate(tables)
+                ],
+            ),
+            (
+                "shared session",
+                lambda: save_tables(
+                    [
+                        (gt, os.path.join(tmp_dir, f"{i}.png"))
+                        for i, gt in enumerate(tables)
+                    ],
+                    web_driver=web_driver,
+                ),
+            ),
+            (
+                "html",
+                lambda: save_tables(
+                    [
+                        (gt, os.path.join(tmp_dir, f"{i}.html"))
+                        for i, gt in enumerate(tables)
+                    ]
+                ),
+            ),
+        ]
+
+        for name, export in modes:
+            t0 = time.perf_counter()
+            try:
+                export()
+            except Exception as e:
+                print(f"{name}: unavailable ({type(e).__name__}: {str(e).splitlines()[0]})")
+                continue
+            elapsed = time.perf_counter() - t0
+
+            print(f"{name}: {elapsed / n_tables * 1000:.1f}ms per table")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,183 @@
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+
+def make_cache_key(endpoint: str, params: dict) -> str:
+    # Sort params (and list values) so equivalent requests share a key
+    normalized = sorted(
+        (key, sorted(value) if isinstance(value, (list, tuple)) else value)
+        for key, value in params.items()
+        if value is not None
+    )
+    return f"{endpoint}?{urlencode(normalized, doseq=True)}"
+
+
+# Bumped when the table layout changes, stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+# Pending last_accessed updates are written with the next set, or once this many
+# hits have piled up
+ACCESS_FLUSH_SIZE = 1_000
+
+
+class ResponseCache:
+    def __init__(self, path: str, max_size_bytes: int = 2 * 1024**3) -> None:
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self.accessed: dict[str, float] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+
+        # Version 0 kept bodies and metadata in a single responses table
+        (version,) = self.conn.execute("PRAGMA user_version").fetchone()
+        if version < 1:
+            self.conn.execute("DROP TABLE IF EXISTS responses")
+
+        # Metadata lives apart from the bodies, so size and expiry scans never
+        # walk the blobs' overflow pages
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS bodies (key TEXT PRIMARY KEY, body BLOB NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_accessed ON entries (last_accessed)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)"
+        )
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.commit()
+
+        # Running total, so inserts only scan when the cache is over budget
+        (self.total_size,) = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+
+    def get(self, key: str) -> bytes | None:
+        now = time.time()
+
+        with self.lock:
+            row = self.conn.execute(
+                """
+                SELECT bodies.body, entries.expires_at
+                FROM entries JOIN bodies USING (key)
+                WHERE key = ?
+                """,
+                (key,),
+            ).fetchone()
+
+            if row is None or (row[1] is not None and row[1] <= now):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.accessed[key] = now
+            if len(self.accessed) >= ACCESS_FLUSH_SIZE:
+                self._flush_accessed()
+                self.conn.commit()
+
+        return row[0]
+
+    def set(self, key: str, body: bytes, ttl: float | None = None) -> None:
+        # ttl=None caches the response permanently
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+
+        with self.lock:
+            self._flush_accessed()
+            self._delete(
+                self.conn.execute(
+                    "SELECT key, size FROM entries WHERE key = ?", (key,)
+                ).fetchall()
+            )
+            self.conn.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?)",
+                (key, len(body), expires_at, now),
+            )
+            self.conn.execute("INSERT INTO bodies VALUES (?, ?)", (key, body))
+            self.total_size += len(body)
+
+            if self.total_size > self.max_size_bytes:
+                self._evict(now)
+            self.conn.commit()
+
+    def _flush_accessed(self) -> None:
+        self.conn.executemany(
+            "UPDATE entries SET last_accessed = ? WHERE key = ?",
+            [(accessed, key) for key, accessed in self.accessed.items()],
+        )
+        self.accessed.clear()
+
+    def _delete(self, rows: list[tuple[str, int]]) -> int:
+        keys = [(key,) for key, _ in rows]
+        self.conn.executemany("DELETE FROM entries WHERE key = ?", keys)
+        self.conn.executemany("DELETE FROM bodies WHERE key = ?", keys)
+        self.total_size -= sum(size for _, size in rows)
+        return len(rows)
+
+    def _evict(self, now: float) -> None:
+        # Drop expired entries first, then least recently used until under budget
+        expired = self.conn.execute(
+            "SELECT key, size FROM entries WHERE expires_at <= ?", (now,)
+        ).fetchall()
+        self.evictions += self._delete(expired)
+
+        if self.total_size <= self.max_size_bytes:
+            return
+
+        evicted = []
+        excess = self.total_size - self.max_size_bytes
+        for key, size in self.conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_accessed"
+        ):
+            if excess <= 0:
+                break
+            evicted.append((key, size))
+            excess -= size
+
+        self.evictions += self._delete(evicted)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.conn.execute("DELETE FROM entries")
+            self.conn.execute("DELETE FROM bodies")
+            self.conn.commit()
+            self.accessed.clear()
+            self.total_size = 0
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            (entries,) = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            size = self.total_size
+
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+        }
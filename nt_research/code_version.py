@@ -0,0 +1,83 @@
+import ast
+import functools
+import hashlib
+import importlib.util
+import inspect
+import os
+from collections.abc import Callable
+
+PACKAGE_NAME = "nt_research"
+
+# Directory holding the package, paths are recorded relative to it
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _find_module_file(name: str) -> str | None:
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+
+    if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+        return None
+
+    return os.path.abspath(spec.origin)
+
+
+def _get_local_imports(path: str) -> set[str]:
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module)
+            # from package import module
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+
+    files = set()
+    for name in names:
+        if name == PACKAGE_NAME or name.startswith(f"{PACKAGE_NAME}."):
+            module_file = _find_module_file(name)
+            if module_file is not None:
+                files.add(module_file)
+
+    return files
+
+
+@functools.cache
+def get_source_files(path: str) -> tuple[str, ...]:
+    # The module itself and every project module it imports, transitively
+    seen = set()
+    stack = [os.path.abspath(path)]
+
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+
+        seen.add(current)
+        stack.extend(_get_local_imports(current) - seen)
+
+    return tuple(sorted(seen))
+
+
+def get_function_id(function: Callable) -> str:
+    # Same id whether the module runs as __main__ or is imported
+    path = os.path.relpath(inspect.getsourcefile(function), REPO_ROOT)
+    return f"{path}:{function.__qualname__}"
+
+
+def get_code_version(function: Callable) -> str:
+    # Edits to the function's module or any helper it imports change the version
+    digest = hashlib.sha256()
+
+    for path in get_source_files(inspect.getsourcefile(function)):
+        digest.update(os.path.relpath(path, REPO_ROOT).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+
+    return digest.hexdigest()
@@ -0,0 +1,178 @@
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import polars as pl
+from nt_research.code_version import get_code_version, get_function_id
+from nt_research.storage import read_json, write_json_atomic, write_parquet_atomic
+
+DAG_CACHE_DIR = "data/cache/dag"
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+
+class Node:
+    def __init__(
+        self,
+        name: str,
+        function: Callable,
+        deps: tuple[str, ...] = (),
+        params: dict | None = None,
+        inputs: tuple[str, ...] = (),
+        outputs: tuple[str, ...] = (),
+    ):
+        # deps are passed positionally as frames, params as keyword arguments.
+        # inputs are fingerprints of external data the node reads. Nodes with
+        # outputs write those files, the rest return a frame that is persisted.
+        self.name = name
+        self.function = function
+        self.deps = tuple(deps)
+        self.params = params or {}
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+
+
+def _sort_nodes(nodes: list[Node]) -> list[Node]:
+    by_name = {node.name: node for node in nodes}
+    if len(by_name) != len(nodes):
+        raise ValueError("Duplicate node names")
+
+    order = []
+    state = {}
+
+    def visit(node: Node) -> None:
+        match state.get(node.name):
+            case "done":
+                return
+            case "visiting":
+                raise ValueError(f"Cycle at node: {node.name}")
+
+        state[node.name] = "visiting"
+        for dep in node.deps:
+            if dep not in by_name:
+                raise ValueError(f"Unknown dependency {dep} of node {node.name}")
+            if by_name[dep].outputs:
+                raise ValueError(f"Dependency {dep} of node {node.name} has no frame")
+            visit(by_name[dep])
+
+        state[node.name] = "done"
+        order.append(node)
+
+    for node in nodes:
+        visit(node)
+
+    return order
+
+
+def _run_node(
+    function: Callable, dep_paths: list[str], params: dict, output_path: str | None
+) -> None:
+    result = function(*[pl.read_parquet(path) for path in dep_paths], **params)
+
+    if output_path is not None:
+        write_parquet_atomic(result, output_path)
+
+
+class DAG:
+    def __init__(self, nodes: list[Node], cache_dir: str = DAG_CACHE_DIR):
+        self.nodes = _sort_nodes(nodes)
+        self.cache_dir = cache_dir
+
+        # Keys chain code version, params and inputs through every ancestor
+        self.keys = {}
+        for node in self.nodes:
+            function = node.function
+            digest = hashlib.sha256()
+            digest.update(get_function_id(function).encode())
+            digest.update(get_code_version(function).encode())
+            params = json.dumps(node.params, sort_keys=True, default=repr)
+            digest.update(params.encode())
+            digest.update(json.dumps([node.inputs, node.outputs]).encode())
+            for dep in node.deps:
+                digest.update(self.keys[dep].encode())
+
+            self.keys[node.name] = digest.hexdigest()[:16]
+
+    def get_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, f"{name}-{self.keys[name]}.parquet")
+
+    def _get_manifest(self) -> dict:
+        return read_json(os.path.join(self.cache_dir, MANIFEST_FILE_NAME))
+
+    def _is_cached(self, node: Node, manifest: dict) -> bool:
+        if node.outputs:
+            return manifest.get(node.name) == self.keys[node.name] and all(
+                os.path.exists(path) for path in node.outputs
+            )
+
+        return os.path.exists(self.get_path(node.name))
+
+    def _remove_stale(self, name: str) -> None:
+        for path in glob.glob(os.path.join(self.cache_dir, f"{name}-*.parquet")):
+            if path != self.get_path(name):
+                os.remove(path)
+
+    def read(self, name: str) -> pl.DataFrame:
+        return pl.read_parquet(self.get_path(name))
+
+    def run(self, max_workers: int | None = None, force: bool = False) -> list[str]:
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        manifest = self._get_manifest()
+        pending = [
+            node for node in self.nodes if force or not self._is_cached(node, manifest)
+        ]
+        pending_names = {node.name for node in pending}
+
+        if not pending:
+            return []
+
+        for node in pending:
+            for path in node.outputs:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        completed = []
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            running = {}
+
+            while pending or running:
+                # Submit every node whose upstream work has finished
+                for node in list(pending):
+                    if any(dep in pending_names for dep in node.deps):
+                        continue
+
+                    future = executor.submit(
+                        _run_node,
+                        node.function,
+                        [self.get_path(dep) for dep in node.deps],
+                        node.params,
+                        None if node.outputs else self.get_path(node.name),
+                    )
+                    running[future] = node
+                    pending.remove(node)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    node = running.pop(future)
+                    future.result()
+
+                    pending_names.remove(node.name)
+                    completed.append(node.name)
+
+                    if node.outputs:
+                        manifest[node.name] = self.keys[node.name]
+                        write_json_atomic(
+                            manifest, os.path.join(self.cache_dir, MANIFEST_FILE_NAME)
+                        )
+                    else:
+                        self._remove_stale(node.name)
+
+        return completed
@@ -1,28 +1,187 @@
+import io
 import os
+import uuid
+import contextlib
+import functools
+import threading
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
 import psycopg2
+from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 from dotenv import load_dotenv
 import polars as pl
-from jinja2 import Template
 
-load_dotenv(override=True)
+if TYPE_CHECKING:
+    import pyarrow as pa
 
-connection_string = os.getenv("DATABASE_URL")
+POOL_MIN_CONNECTIONS = 1
+POOL_MAX_CONNECTIONS = 16
 
+COPY_CHUNK_SIZE = 500_000
+
+POSTGRES_TYPES = {
+    pl.Boolean: "boolean",
+    pl.Int8: "smallint",
+    pl.Int16: "smallint",
+    pl.Int32: "integer",
+    pl.Int64: "bigint",
+    pl.UInt8: "smallint",
+    pl.UInt16: "integer",
+    pl.UInt32: "bigint",
+    pl.UInt64: "numeric",
+    pl.Float32: "real",
+    pl.Float64: "double precision",
+    pl.String: "text",
+    pl.Date: "date",
+}
+
+
+@functools.cache
+def get_connection_string() -> str | None:
+    # Read on first use so importing this module has no side effects
+    load_dotenv(override=True)
+    return os.getenv("DATABASE_URL")
+
+
+def __getattr__(name: str):
+    if name == "connection_string":
+        return get_connection_string()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Pool and its checkout slots per pid, so forked workers never share their
+# parent's sockets
+_pools: dict[int, tuple[ThreadedConnectionPool, threading.BoundedSemaphore]] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool_slots() -> tuple[ThreadedConnectionPool, threading.BoundedSemaphore]:
+    pid = os.getpid()
+
+    with _pools_lock:
+        if pid not in _pools:
+            _pools[pid] = (
+                ThreadedConnectionPool(
+                    POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS, get_connection_string()
+                ),
+                threading.BoundedSemaphore(POOL_MAX_CONNECTIONS),
+            )
+
+        return _pools[pid]
+
+
+def get_pool() -> ThreadedConnectionPool:
+    return _get_pool_slots()[0]
+
+
+def close_pool() -> None:
+    # No-op when this process never opened a pool
+    with _pools_lock:
+        pool_slots = _pools.pop(os.getpid(), None)
+
+    if pool_slots is not None:
+        pool_slots[0].closeall()
+
+
+@contextlib.contextmanager
+def get_connection():
+    pool, slots = _get_pool_slots()
+
+    # An exhausted pool raises PoolError, so wait for a connection to come back
+    with slots:
+        conn = pool.getconn()
+
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            # Includes GeneratorExit from a stream abandoned part way through
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            # Broken connections are dropped instead of going back to the pool
+            pool.putconn(conn, close=bool(conn.closed))
 
-def execute_query(query: str, params=None):
-    conn = psycopg2.connect(connection_string)
 
-    try:
+def execute_query(query: str, params=None):
+    with get_connection() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cursor:
             cursor.execute(query, params)
             if cursor.description:
                 return [dict(row) for row in cursor.fetchall()]
             else:
-                conn.commit()
                 return cursor.rowcount
-    finally:
-        conn.close()
+
+
+def _iter_chunks(query: str, params, chunk_size: int, cursor_factory=None):
+    # Named cursors stay on the server, only chunk_size rows are held at a time
+    with get_connection() as conn:
+        with conn.cursor(
+            name=f"stream_{uuid.uuid4().hex}", cursor_factory=cursor_factory
+        ) as cursor:
+            cursor.itersize = chunk_size
+            cursor.execute(query, params)
+
+            while rows := cursor.fetchmany(chunk_size):
+                yield cursor.description, rows
+
+
+def stream_query(
+    query: str, params=None, chunk_size: int = 10_000
+) -> Iterator[list[dict]]:
+    for _, rows in _iter_chunks(query, params, chunk_size, RealDictCursor):
+        yield [dict(row) for row in rows]
+
+
+def _get_arrow_types() -> dict:
+    import pyarrow as pa
+
+    # Postgres type OIDs, anything else is inferred per chunk
+    return {
+        16: pa.bool_(),
+        20: pa.int64(),
+        21: pa.int16(),
+        23: pa.int32(),
+        700: pa.float32(),
+        701: pa.float64(),
+        25: pa.string(),
+        1043: pa.string(),
+        1700: pa.float64(),
+        1082: pa.date32(),
+        1114: pa.timestamp("us"),
+        1184: pa.timestamp("us", tz="UTC"),
+    }
+
+
+def stream_query_arrow(
+    query: str, params=None, chunk_size: int = 100_000
+) -> Iterator["pa.RecordBatch"]:
+    import pyarrow as pa
+
+    # Known types are cast explicitly so every batch has the same schema,
+    # even when a chunk is all null or holds Decimal values
+    arrow_types = _get_arrow_types()
+    for description, rows in _iter_chunks(query, params, chunk_size):
+        arrays = []
+        for column, values in zip(description, zip(*rows)):
+            array = pa.array(values)
+            if column.type_code in arrow_types:
+                array = array.cast(arrow_types[column.type_code])
+            arrays.append(array)
+
+        yield pa.RecordBatch.from_arrays(
+            arrays, names=[column.name for column in description]
+        )
+
+
+def stream_dataframes(
+    query: str, params=None, chunk_size: int = 100_000
+) -> Iterator[pl.DataFrame]:
+    for batch in stream_query_arrow(query, params, chunk_size):
+        yield pl.from_arrow(batch)
 
 
 def execute_sql_file(file_path: str, params=None):
@@ -30,6 +189,8 @@ def execute_sql_file(file_path: str, params=None):
         sql_content = f.read()
 
     if params:
+        from jinja2 import Template
+
         template = Template(sql_content)
         sql_content = template.render(**params)
 
@@ -39,14 +200,226 @@ def execute_sql_file(file_path: str, params=None):
 def write_dataframe(df: pl.DataFrame, table_name: str):
     df.write_database(
         table_name=table_name,
-        connection=connection_string,
+        connection=get_connection_string(),
         if_table_exists="replace",
         engine="sqlalchemy",
     )
 
 
-def read_dataframe(table_name: str) -> pl.DataFrame:
-    return pl.read_database_uri(
-        query=f"SELECT * FROM {table_name}",
-        uri=connection_string,
+def get_table_identifier(table_name: str) -> sql.Composable:
+    # "schema.table" or "table", quoted so names are never interpolated raw
+    return sql.Identifier(*table_name.split("."))
+
+
+def _get_postgres_type(dtype: pl.DataType) -> str:
+    if isinstance(dtype, pl.Datetime):
+        return "timestamptz" if dtype.time_zone is not None else "timestamp"
+
+    if dtype.base_type() in POSTGRES_TYPES:
+        return POSTGRES_TYPES[dtype.base_type()]
+
+    raise ValueError(f"Unsupported dtype: {dtype}")
+
+
+def create_table(df: pl.DataFrame, table_name: str, primary_key=None) -> None:
+    columns = [
+        sql.SQL("{} {}").format(
+            sql.Identifier(name), sql.SQL(_get_postgres_type(dtype))
+        )
+        for name, dtype in df.schema.items()
+    ]
+
+    if primary_key:
+        columns.append(
+            sql.SQL("PRIMARY KEY ({})").format(
+                sql.SQL(", ").join(map(sql.Identifier, primary_key))
+            )
+        )
+
+    with get_connection() as conn, conn.cursor() as cursor:
+        cursor.execute(
+            sql.SQL("CREATE TABLE IF NOT EXISTS {} ({})").format(
+                get_table_identifier(table_name), sql.SQL(", ").join(columns)
+            )
+        )
+
+
+def get_primary_key(table_name: str) -> list[str]:
+    rows = execute_query(
+        """
+        SELECT a.attname
+        FROM pg_index i
+        JOIN pg_attribute a
+          ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = %s::regclass AND i.indisprimary
+        ORDER BY array_position(i.indkey, a.attnum)
+        """,
+        (table_name,),
+    )
+
+    return [row["attname"] for row in rows]
+
+
+def _copy_chunks(
+    cursor, df: pl.DataFrame, table: sql.Composable, chunk_size: int
+) -> None:
+    # CSV keeps "" distinct from NULL (an unquoted empty field)
+    statement = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+        table, sql.SQL(", ").join(map(sql.Identifier, df.columns))
+    )
+
+    for chunk in df.iter_slices(chunk_size):
+        buffer = io.BytesIO()
+        chunk.write_csv(buffer, include_header=False)
+        buffer.seek(0)
+        cursor.copy_expert(statement.as_string(cursor), buffer)
+
+
+def copy_dataframe(
+    df: pl.DataFrame,
+    table_name: str,
+    mode: str = "append",
+    primary_key: list[str] | None = None,
+    chunk_size: int = COPY_CHUNK_SIZE,
+) -> int:
+    # Bulk load through COPY FROM STDIN, keeping the table and its indexes
+    table = get_table_identifier(table_name)
+
+    if mode not in ("append", "upsert"):
+        raise ValueError(f"Unsupported mode: {mode}")
+
+    if mode == "upsert" and not primary_key:
+        primary_key = get_primary_key(table_name)
+        if not primary_key:
+            raise ValueError(f"No primary key on {table_name} to upsert on")
+
+    # One row per key, ON CONFLICT cannot touch the same row twice
+    if mode == "upsert":
+        df = df.unique(subset=primary_key, keep="last", maintain_order=True)
+
+    with get_connection() as conn, conn.cursor() as cursor:
+        if mode == "append":
+            _copy_chunks(cursor, df, table, chunk_size)
+            return df.height
+
+        # Upsert: COPY into a staging table, then merge in one statement
+        staging = sql.Identifier(f"staging_{uuid.uuid4().hex}")
+        columns = sql.SQL(", ").join(map(sql.Identifier, df.columns))
+        updates = [col for col in df.columns if col not in primary_key]
+
+        cursor.execute(
+            sql.SQL(
+                "CREATE TEMP TABLE {} (LIKE {} INCLUDING DEFAULTS) ON COMMIT DROP"
+            ).format(staging, table)
+        )
+        _copy_chunks(cursor, df, staging, chunk_size)
+
+        conflict_action = (
+            sql.SQL("DO UPDATE SET {}").format(
+                sql.SQL(", ").join(
+                    sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(col))
+                    for col in updates
+                )
+            )
+            if updates
+            else sql.SQL("DO NOTHING")
+        )
+
+        cursor.execute(
+            sql.SQL(
+                "INSERT INTO {} ({}) SELECT {} FROM {} ON CONFLICT ({}) {}"
+            ).format(
+                table,
+                columns,
+                columns,
+                staging,
+                sql.SQL(", ").join(map(sql.Identifier, primary_key)),
+                conflict_action,
+            )
+        )
+
+        return cursor.rowcount
+
+
+def build_select(
+    conn,
+    table_name: str,
+    columns: list[str] | None = None,
+    where: str | None = None,
+    params=None,
+    order_by: list[str] | None = None,
+    descending: bool = False,
+) -> str:
+    # where is raw SQL with %s placeholders, values are bound from params.
+    # Quoting depends on the connection's encoding, so render on the caller's
+    statement = sql.SQL("SELECT {} FROM {}").format(
+        sql.SQL(", ").join(map(sql.Identifier, columns)) if columns else sql.SQL("*"),
+        get_table_identifier(table_name),
+    )
+
+    if where is not None:
+        statement += sql.SQL(" WHERE ") + sql.SQL(where)
+
+    if order_by:
+        direction = sql.SQL(" DESC" if descending else " ASC")
+        statement += sql.SQL(" ORDER BY ") + sql.SQL(", ").join(
+            sql.Identifier(col) + direction for col in order_by
+        )
+
+    # connectorx takes no parameters, so bind them client side
+    with conn.cursor() as cursor:
+        return cursor.mogrify(statement.as_string(conn), params).decode()
+
+
+def read_dataframe(
+    table_name: str,
+    columns: list[str] | None = None,
+    where: str | None = None,
+    params=None,
+    order_by: list[str] | None = None,
+    descending: bool = False,
+    partition_on: str | None = None,
+    partition_num: int | None = None,
+    conn=None,
+) -> pl.DataFrame:
+    partition_num = partition_num or os.cpu_count()
+    partitioned = partition_on is not None and partition_num != 1
+
+    # connectorx splits the min/max range of an integer column across one
+    # connection per partition, so ordering has to happen after the read
+    # connectorx also needs the partition column in the projection
+    selected = columns
+    if partitioned and columns and partition_on not in columns:
+        selected = [*columns, partition_on]
+
+    select = (
+        table_name,
+        selected,
+        where,
+        params,
+        None if partitioned else order_by,
+        descending,
+    )
+
+    # connectorx opens its own connections, so the query is rendered on conn or
+    # a short-lived one and never holds a pool slot
+    if conn is None:
+        with contextlib.closing(psycopg2.connect(get_connection_string())) as conn:
+            query = build_select(conn, *select)
+    else:
+        query = build_select(conn, *select)
+
+    if not partitioned:
+        return pl.read_database_uri(query=query, uri=get_connection_string())
+
+    df = pl.read_database_uri(
+        query=query,
+        uri=get_connection_string(),
+        partition_on=partition_on,
+        partition_num=partition_num,
     )
+
+    if order_by:
+        df = df.sort(order_by, descending=descending)
+
+    return df.select(columns) if columns else df
@@ -0,0 +1,170 @@
+import glob
+import os
+import datetime as dt
+from zoneinfo import ZoneInfo
+import polars as pl
+from nt_research.storage import read_json, write_json_atomic
+
+DATA_DIR = "data"
+
+# Game dates follow the same calendar as the daily strategy
+GAME_DATE_TIME_ZONE = "America/Denver"
+
+# Roughly 20 tickers of 1-minute candles per row group
+ROW_GROUP_SIZE = 32_768
+
+HIVE_SCHEMA = {"series_ticker": pl.String, "game_date": pl.Date}
+
+# Dataset-level facts kept next to the partitions
+METADATA_FILE = "metadata.json"
+
+
+def _dataset_name(daily: bool) -> str:
+    return "history_daily" if daily else "history"
+
+
+def _get_candle_offset(lf: pl.LazyFrame) -> dt.timedelta:
+    # Furthest any candle's end_period_ts sits from its game's kickoff
+    offset = (
+        lf.select(
+            pl.col("end_period_ts").sub(pl.col("game_start_time_utc")).abs().max()
+        )
+        .collect()
+        .item()
+    )
+    return offset if offset is not None else dt.timedelta(0)
+
+
+def _get_partitions(root: str) -> list[str]:
+    return glob.glob(os.path.join(root, "*", "*", "*.parquet"))
+
+
+def _scan_partitions(root: str) -> pl.LazyFrame:
+    return pl.scan_parquet(
+        os.path.join(root, "**", "*.parquet"),
+        hive_partitioning=True,
+        hive_schema=HIVE_SCHEMA,
+    )
+
+
+def write_history(
+    df: pl.DataFrame, daily: bool = False, data_dir: str = DATA_DIR
+) -> None:
+    # Hive layout: {name}/series_ticker=.../game_date=.../data.parquet
+    root = os.path.join(data_dir, _dataset_name(daily))
+
+    df = df.with_columns(
+        pl.col("game_start_time_utc")
+        .dt.convert_time_zone(GAME_DATE_TIME_ZONE)
+        .dt.date()
+        .alias("game_date")
+    )
+
+    # Record how far candles sit from kickoff before adding any partition, so
+    # scan_history never prunes with a window narrower than the data
+    metadata_path = os.path.join(root, METADATA_FILE)
+    metadata = read_json(metadata_path)
+    offsets = [_get_candle_offset(df.lazy())]
+
+    if "max_candle_offset_seconds" in metadata:
+        offsets.append(dt.timedelta(seconds=metadata["max_candle_offset_seconds"]))
+    elif _get_partitions(root):
+        # Partitions written before the offset was recorded
+        offsets.append(_get_candle_offset(_scan_partitions(root)))
+
+    os.makedirs(root, exist_ok=True)
+    metadata["max_candle_offset_seconds"] = max(offsets).total_seconds()
+    write_json_atomic(metadata, metadata_path)
+
+    for (series_ticker, game_date), partition in df.partition_by(
+        "series_ticker", "game_date", as_dict=True
+    ).items():
+        directory = os.path.join(
+            root, f"series_ticker={series_ticker}", f"game_date={game_date}"
+        )
+        os.makedirs(directory, exist_ok=True)
+
+        path = os.path.join(directory, "data.parquet")
+        tmp_path = f"{path}.tmp"
+
+        # Partition values live in the path, not the file
+        partition.drop("series_ticker", "game_date").sort(
+            "ticker", "end_period_ts"
+        ).write_parquet(
+            tmp_path,
+            row_group_size=ROW_GROUP_SIZE,
+            statistics=True,
+        )
+        os.replace(tmp_path, path)
+
+
+def resolve_history_path(daily: bool = False, data_dir: str = DATA_DIR) -> str:
+    # Prefer the partitioned dataset, then the latest dated snapshot
+    name = _dataset_name(daily)
+    root = os.path.join(data_dir, name)
+
+    if _get_partitions(root):
+        return root
+
+    snapshots = sorted(
+        glob.glob(os.path.join(data_dir, f"????-??-??_{name}.parquet"))
+    )
+
+    if not snapshots:
+        raise FileNotFoundError(f"No {name} dataset found in {data_dir}")
+
+    return snapshots[-1]
+
+
+def _get_game_date(ts: dt.datetime) -> dt.date:
+    return ts.astimezone(ZoneInfo(GAME_DATE_TIME_ZONE)).date()
+
+
+def _as_utc(ts: dt.datetime | None) -> dt.datetime | None:
+    # end_period_ts is stored in UTC, so naive bounds are read as UTC too
+    if ts is None or ts.tzinfo is not None:
+        return ts
+
+    return ts.replace(tzinfo=dt.timezone.utc)
+
+
+def _get_max_candle_offset(root: str) -> dt.timedelta | None:
+    seconds = read_json(os.path.join(root, METADATA_FILE)).get(
+        "max_candle_offset_seconds"
+    )
+    return None if seconds is None else dt.timedelta(seconds=seconds)
+
+
+def scan_history(
+    daily: bool = False,
+    series_ticker: str | None = None,
+    start: dt.datetime | None = None,
+    end: dt.datetime | None = None,
+    source: str | None = None,
+) -> pl.LazyFrame:
+    path = source if source is not None else resolve_history_path(daily)
+    start, end = _as_utc(start), _as_utc(end)
+
+    # game_date pruning widens the bounds by the offset recorded for this
+    # dataset, and is skipped when there is none
+    offset = None
+    if os.path.isdir(path):
+        lf = _scan_partitions(path)
+        offset = _get_max_candle_offset(path)
+    else:
+        lf = pl.scan_parquet(path)
+
+    if series_ticker is not None:
+        lf = lf.filter(pl.col("series_ticker").eq(series_ticker))
+
+    if start is not None:
+        if offset is not None:
+            lf = lf.filter(pl.col("game_date").ge(_get_game_date(start - offset)))
+        lf = lf.filter(pl.col("end_period_ts").ge(start))
+
+    if end is not None:
+        if offset is not None:
+            lf = lf.filter(pl.col("game_date").le(_get_game_date(end + offset)))
+        lf = lf.filter(pl.col("end_period_ts").le(end))
+
+    return lf
@@ -0,0 +1,189 @@
+import os
+import uuid
+import datetime as dt
+import polars as pl
+from nt_research.kalshi import CANDLESTICKS_SCHEMA, get_kalshi_client
+from nt_research.storage import PartStore, write_parquet_atomic
+
+MANIFEST_SCHEMA = {
+    "ticker": pl.String,
+    "last_end_period_ts": pl.Int64,
+    "part": pl.String,
+}
+
+MARKETS_SCHEMA = {
+    "series_ticker": pl.String,
+    "ticker": pl.String,
+    "game_start_time_utc": pl.Datetime("us", "UTC"),
+    "result": pl.String,
+}
+
+FAILURES_SCHEMA = {
+    "ticker": pl.String,
+    "game_start_time_utc": pl.Datetime("us", "UTC"),
+    "error": pl.String,
+    "attempts": pl.Int32,
+}
+
+# Runs a market may fail before it is no longer retried or listed again
+MAX_FAILURE_ATTEMPTS = 5
+
+PART_SCHEMAS = {"markets": MARKETS_SCHEMA, "candlesticks": CANDLESTICKS_SCHEMA}
+
+
+class IncrementalStore(PartStore):
+    def __init__(self, root: str) -> None:
+        super().__init__(root, MANIFEST_SCHEMA)
+        self.failures_path = os.path.join(root, "failures.parquet")
+
+    def get_failures(self) -> pl.DataFrame:
+        if not os.path.exists(self.failures_path):
+            return pl.DataFrame(schema=FAILURES_SCHEMA)
+
+        failures = pl.read_parquet(self.failures_path)
+
+        # Files written before attempts were counted
+        if "attempts" not in failures.columns:
+            failures = failures.with_columns(pl.lit(1, pl.Int32).alias("attempts"))
+
+        return failures
+
+    def get_exhausted_failures(self) -> pl.DataFrame:
+        return self.get_failures().filter(pl.col("attempts").ge(MAX_FAILURE_ATTEMPTS))
+
+    def update_failures(self, markets: pl.DataFrame, failures: dict[str, str]) -> None:
+        # Markets attempted this run replace their old entries, successes drop out
+        old_failures = self.get_failures()
+
+        failed = (
+            markets.filter(pl.col("ticker").is_in(list(failures)))
+            .join(old_failures.select("ticker", "attempts"), on="ticker", how="left")
+            .select(
+                "ticker",
+                "game_start_time_utc",
+                pl.col("ticker")
+                .replace_strict(failures, return_dtype=pl.String)
+                .alias("error"),
+                pl.col("attempts").fill_null(0).add(1),
+            )
+        )
+
+        write_parquet_atomic(
+            pl.concat(
+                [old_failures.join(markets, on="ticker", how="anti"), failed]
+            ).cast(FAILURES_SCHEMA),
+            self.failures_path,
+        )
+
+    def get_min_close_ts(self, lookback: dt.timedelta) -> dt.datetime | None:
+        # Reach back far enough to list the oldest failed market again, markets
+        # that keep failing stop pinning the window once they are given up on
+        failures = self.get_failures()
+        retried = failures.filter(pl.col("attempts").lt(MAX_FAILURE_ATTEMPTS))
+        starts = [
+            self.read_markets()["game_start_time_utc"].max(),
+            retried["game_start_time_utc"].min(),
+        ]
+        starts = [start for start in starts if start is not None]
+
+        if not starts:
+            return None
+
+        return min(starts) - lookback
+
+    def get_new_markets(self, markets: pl.DataFrame) -> pl.DataFrame:
+        return markets.join(self.get_manifest(), on="ticker", how="anti").join(
+            self.get_exhausted_failures(), on="ticker", how="anti"
+        )
+
+    def append(self, markets: pl.DataFrame, candlesticks: pl.DataFrame) -> None:
+        part = uuid.uuid4().hex
+
+        # Parts are only visible once the manifest references them
+        write_parquet_atomic(markets, self._part_path("markets", part))
+
+        if candlesticks.is_empty():
+            last_end_period_ts = markets.select(
+                "ticker", pl.lit(None, pl.Int64).alias("last_end_period_ts")
+            )
+        else:
+            write_parquet_atomic(candlesticks, self._part_path("candlesticks", part))
+            last_end_period_ts = markets.select("ticker").join(
+                candlesticks.group_by("ticker").agg(
+                    pl.col("end_period_ts").max().alias("last_end_period_ts")
+                ),
+                on="ticker",
+                how="left",
+            )
+
+        manifest = pl.concat(
+            [
+                self.get_manifest(),
+                last_end_period_ts.with_columns(pl.lit(part).alias("part")),
+            ]
+        )
+
+        write_parquet_atomic(manifest, self.manifest_path)
+
+    def _read_parts(self, kind: str) -> pl.DataFrame:
+        parts = self.get_manifest()["part"].unique(maintain_order=True).to_list()
+        paths = [self._part_path(kind, part) for part in parts]
+        paths = [path for path in paths if os.path.exists(path)]
+
+        if not paths:
+            return pl.DataFrame(schema=PART_SCHEMAS[kind])
+
+        return pl.concat(
+            [pl.read_parquet(path) for path in paths], how="diagonal_relaxed"
+        )
+
+    def read_markets(self) -> pl.DataFrame:
+        return self._read_parts("markets")
+
+    def read_candlesticks(self) -> pl.DataFrame:
+        return self._read_parts("candlesticks")
+
+
+def ingest_markets(
+    store: IncrementalStore,
+    markets: pl.DataFrame,
+    window: dt.timedelta,
+    period_interval: int,
+    max_workers: int = 8,
+    batch_size: int = 100,
+) -> dict[str, str]:
+    kalshi_client = get_kalshi_client()
+    store.remove_orphan_parts()
+
+    new_markets = store.get_new_markets(markets)
+    print(f"Ingesting {new_markets.height} new markets.")
+
+    failures = {}
+    for batch in new_markets.iter_slices(batch_size):
+        market_windows = [
+            {
+                "series_ticker": market["series_ticker"],
+                "ticker": market["ticker"],
+                "start_ts": market["game_start_time_utc"] - window,
+                "end_ts": market["game_start_time_utc"] + window,
+            }
+            for market in batch.to_dicts()
+        ]
+
+        candlesticks, batch_failures = kalshi_client.get_markets_candlesticks(
+            market_windows,
+            period_interval=period_interval,
+            max_workers=max_workers,
+        )
+
+        # Failed tickers stay out of the manifest and are recorded so the next
+        # runs list and retry them, however old they are, up to
+        # MAX_FAILURE_ATTEMPTS times
+        store.append(
+            batch.filter(pl.col("ticker").is_in(list(batch_failures)).not_()),
+            candlesticks,
+        )
+        store.update_failures(batch, batch_failures)
+        failures.update(batch_failures)
+
+    return failures
@@ -0,0 +1,117 @@
+import argparse
+import datetime as dt
+import os
+import polars as pl
+from nt_research.database import copy_dataframe, execute_sql_file
+from nt_research.datasets.history import scan_history
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sql")
+
+MARKETS_TABLE = "markets"
+
+MARKETS_COLUMNS = ["ticker", "series_ticker", "game_start_time_utc", "result"]
+
+CANDLESTICKS_COLUMNS = [
+    "ticker",
+    "series_ticker",
+    "end_period_ts",
+    "yes_bid_open",
+    "yes_bid_low",
+    "yes_bid_high",
+    "yes_bid_close",
+    "yes_ask_open",
+    "yes_ask_low",
+    "yes_ask_high",
+    "yes_ask_close",
+    "volume",
+    "open_interest",
+]
+
+
+def _candlesticks_table(daily: bool) -> str:
+    return "candlesticks_daily" if daily else "candlesticks"
+
+
+def create_schema(daily: bool = False) -> None:
+    # Every statement is IF NOT EXISTS, so this is safe to run on each load
+    execute_sql_file(os.path.join(SQL_DIR, "create_markets.sql"))
+    execute_sql_file(
+        os.path.join(SQL_DIR, "create_candlesticks.sql"),
+        {"table_name": _candlesticks_table(daily)},
+    )
+
+
+def create_partitions(months: list[dt.date], daily: bool = False) -> None:
+    if not months:
+        return
+
+    # One partition per calendar month (UTC)
+    partitions = [
+        {
+            "name": month.strftime("%Y_%m"),
+            "start": f"{month:%Y-%m}-01 00:00:00+00",
+            "end": (
+                f"{month.year + month.month // 12}-{month.month % 12 + 1:02d}"
+                "-01 00:00:00+00"
+            ),
+        }
+        for month in months
+    ]
+
+    execute_sql_file(
+        os.path.join(SQL_DIR, "create_candlesticks_partitions.sql"),
+        {"table_name": _candlesticks_table(daily), "partitions": partitions},
+    )
+
+
+def load_history(
+    history: pl.LazyFrame | pl.DataFrame, daily: bool = False
+) -> tuple[int, int]:
+    # Upserts on the primary keys, so reloading the same data is a no-op
+    history = history.lazy().with_columns(
+        pl.col("end_period_ts").dt.convert_time_zone("UTC")
+    )
+
+    create_schema(daily)
+
+    months = (
+        history.select(pl.col("end_period_ts").dt.truncate("1mo").dt.date().unique())
+        .collect()
+        .to_series()
+        .sort()
+        .to_list()
+    )
+    create_partitions(months, daily)
+
+    markets = history.select(MARKETS_COLUMNS).unique("ticker").collect()
+    n_markets = copy_dataframe(markets, MARKETS_TABLE, mode="upsert")
+
+    # One month at a time keeps memory bounded to a single partition's rows
+    n_candlesticks = 0
+    for month in months:
+        candlesticks = (
+            history.filter(
+                pl.col("end_period_ts").dt.truncate("1mo").dt.date().eq(month)
+            )
+            .select(CANDLESTICKS_COLUMNS)
+            .collect()
+        )
+
+        n_candlesticks += copy_dataframe(
+            candlesticks, _candlesticks_table(daily), mode="upsert"
+        )
+
+    return n_markets, n_candlesticks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--daily", action="store_true")
+    parser.add_argument("--source", default=None)
+    args = parser.parse_args()
+
+    n_markets, n_candlesticks = load_history(
+        scan_history(daily=args.daily, source=args.source), daily=args.daily
+    )
+
+    print(f"Upserted {n_markets} markets and {n_candlesticks} candlesticks.")
@@ -0,0 +1,99 @@
+import polars as pl
+
+OHLC_COLUMNS = [
+    f"{side}_{field}"
+    for side in ["yes_bid", "yes_ask"]
+    for field in ["open", "low", "high", "close"]
+]
+
+
+def _candle_aggs() -> list[pl.Expr]:
+    # Empty minutes have null quotes, so skip them when picking open/close
+    return [
+        *[
+            pl.col(col).drop_nulls().first()
+            if col.endswith("_open")
+            else pl.col(col).drop_nulls().last()
+            if col.endswith("_close")
+            else pl.col(col).min()
+            if col.endswith("_low")
+            else pl.col(col).max()
+            for col in OHLC_COLUMNS
+        ],
+        pl.col("volume").sum(),
+        pl.col("open_interest").drop_nulls().last(),
+        pl.col("series_ticker").first(),
+        pl.col("game_start_time_utc").first(),
+        pl.col("result").first(),
+    ]
+
+
+def resample_history(
+    history: pl.DataFrame | pl.LazyFrame,
+    every: str,
+    offset: str | None = None,
+) -> pl.DataFrame:
+    # Candles are labeled by the end of their period, like the API's end_period_ts
+    return (
+        history.lazy()
+        .sort("ticker", "end_period_ts")
+        .group_by_dynamic(
+            "end_period_ts",
+            every=every,
+            offset=offset,
+            closed="right",
+            label="right",
+            group_by="ticker",
+        )
+        .agg(_candle_aggs())
+        .select(
+            "end_period_ts",
+            *OHLC_COLUMNS,
+            "volume",
+            "open_interest",
+            "series_ticker",
+            "ticker",
+            "game_start_time_utc",
+            "result",
+        )
+        .sort("ticker", "end_period_ts")
+        .collect()
+    )
+
+
+def resample_history_game_relative(
+    history: pl.DataFrame | pl.LazyFrame,
+    every: int,
+) -> pl.DataFrame:
+    # Buckets of `every` minutes aligned to kickoff, labeled by bucket end elapsed time
+    return (
+        history.lazy()
+        .with_columns(
+            pl.col("end_period_ts")
+            .sub(pl.col("game_start_time_utc"))
+            .dt.total_minutes()
+            .alias("elapsed_time")
+        )
+        .sort("ticker", "elapsed_time")
+        .group_by_dynamic(
+            "elapsed_time",
+            every=f"{every}i",
+            closed="right",
+            label="right",
+            group_by="ticker",
+        )
+        .agg(pl.col("end_period_ts").last(), *_candle_aggs())
+        .select(
+            "end_period_ts",
+            "elapsed_time",
+            *OHLC_COLUMNS,
+            "volume",
+            "open_interest",
+            "series_ticker",
+            "ticker",
+            "game_start_time_utc",
+            "result",
+        )
+        .sort("ticker", "elapsed_time")
+        .collect()
+    )
@@ -1,15 +1,28 @@
+import argparse
 import polars as pl
-from nt_research.kalshi import kalshi_client
-from tqdm import tqdm
+from nt_research.kalshi import get_kalshi_client
+from nt_research.datasets.incremental import IncrementalStore, ingest_markets
+from nt_research.datasets.history import write_history
+from nt_research.datasets.resample import resample_history
 import datetime as dt
 
 
-def get_settled_markets_daily_dataset():
+def get_settled_markets_daily_dataset(
+    max_workers: int = 8, incremental: bool = False
+):
+    kalshi_client = get_kalshi_client()
     today = dt.date.today()
     series_ticker = "KXNCAAFGAME"
+    window = dt.timedelta(hours=24)
+
+    # Only list markets that closed since the last ingested game
+    store = IncrementalStore("data/settled_cfb_markets_daily") if incremental else None
+    min_close_ts = (
+        store.get_min_close_ts(lookback=dt.timedelta(days=7)) if incremental else None
+    )
 
     markets = kalshi_client.get_markets(
-        series_ticker=series_ticker, status="settled"
+        series_ticker=series_ticker, status="settled", min_close_ts=min_close_ts
     ).select(
         pl.col("series_ticker"),
         pl.col("ticker"),
@@ -23,22 +36,35 @@ def get_settled_markets_daily_dataset():
 
     print(markets)
 
-    candlesticks_list = []
-    for market in tqdm(markets.to_dicts(), "Downloading historical data."):
-        start_ts = market["game_start_time_utc"] - dt.timedelta(hours=24)
-        end_ts = market["game_start_time_utc"] + dt.timedelta(hours=24)
-
-        candlesticks_ = kalshi_client.get_market_candlesticks(
-            series_ticker=market["series_ticker"],
-            ticker=market["ticker"],
-            start_ts=start_ts,
-            end_ts=end_ts,
+    if incremental:
+        failures = ingest_markets(
+            store,
+            markets,
+            window=window,
             period_interval=1440, # 1 day
+            max_workers=max_workers,
+        )
+        markets = store.read_markets()
+        candlesticks = store.read_candlesticks()
+    else:
+        market_windows = [
+            {
+                "series_ticker": market["series_ticker"],
+                "ticker": market["ticker"],
+                "start_ts": market["game_start_time_utc"] - window,
+                "end_ts": market["game_start_time_utc"] + window,
+            }
+            for market in markets.to_dicts()
+        ]
+
+        candlesticks, failures = kalshi_client.get_markets_candlesticks(
+            market_windows,
+            period_interval=1440, # 1 day
+            max_workers=max_workers,
         )
 
-        candlesticks_list.append(candlesticks_)
-
-    candlesticks: pl.DataFrame = pl.concat(candlesticks_list)
+    if failures:
+        print(f"Failed to download {len(failures)} markets: {failures}")
 
     markets.write_parquet(f"data/{today}_markets_daily.parquet")
     candlesticks.write_parquet(f"data/{today}_candlesticks_daily.parquet")
@@ -56,7 +82,32 @@ def get_settled_markets_daily_dataset():
     print(df_history)
 
     df_history.write_parquet(f"data/{today}_history_daily.parquet")
+    write_history(df_history, daily=True)
+
+
+def get_settled_markets_daily_dataset_from_minutes(history_path: str):
+    # Derive daily candles from the 1-minute history instead of crawling the API.
+    # Days only cover the minute window downloaded around each game.
+    today = dt.date.today()
+
+    df_history = resample_history(pl.scan_parquet(history_path), every="1d")
+
+    print(df_history)
+
+    df_history.write_parquet(f"data/{today}_history_daily.parquet")
+    write_history(df_history, daily=True)
 
 
 if __name__ == "__main__":
-    get_settled_markets_daily_dataset()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--from-minutes", help="1-minute history parquet to resample")
+    args = parser.parse_args()
+
+    if args.from_minutes is not None:
+        get_settled_markets_daily_dataset_from_minutes(args.from_minutes)
+    else:
+        get_settled_markets_daily_dataset(
+            max_workers=args.max_workers, incremental=args.incremental
+        )
@@ -1,20 +1,281 @@
 import os
 from dotenv import load_dotenv
 import datetime as dt
+import functools
+from collections.abc import Iterator
+import email.utils
+import io
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
+from requests.adapters import HTTPAdapter
 import polars as pl
-
-load_dotenv(override=True)
+from tqdm import tqdm
+from nt_research.cache import ResponseCache, make_cache_key
 
 BASE_URL = "https://api.elections.kalshi.com/trade-api/v2/"
 
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+MARKETS_SCHEMA = {
+    "ticker": pl.String,
+    "event_ticker": pl.String,
+    "title": pl.String,
+    "expected_expiration_time": pl.String,
+    "status": pl.String,
+    "yes_bid": pl.Int64,
+    "yes_ask": pl.Int64,
+    "no_bid": pl.Int64,
+    "no_ask": pl.Int64,
+    "volume": pl.Int64,
+    "result": pl.String,
+    "series_ticker": pl.String,
+}
+
+MARKETS_API_COLUMNS = [col for col in MARKETS_SCHEMA if col != "series_ticker"]
+
+_OHLC = pl.Struct(
+    {"open": pl.Int64, "low": pl.Int64, "high": pl.Int64, "close": pl.Int64}
+)
+
+# Only the fields listed here are decoded, everything else in the payload is skipped
+CANDLESTICKS_RESPONSE_SCHEMA = {
+    "candlesticks": pl.List(
+        pl.Struct(
+            {
+                "end_period_ts": pl.Int64,
+                "yes_bid": _OHLC,
+                "yes_ask": _OHLC,
+                "volume": pl.Int64,
+                "open_interest": pl.Int64,
+            }
+        )
+    )
+}
+
+CANDLESTICKS_SCHEMA = {
+    "end_period_ts": pl.Int64,
+    "yes_bid_open": pl.Int64,
+    "yes_bid_low": pl.Int64,
+    "yes_bid_high": pl.Int64,
+    "yes_bid_close": pl.Int64,
+    "yes_ask_open": pl.Int64,
+    "yes_ask_low": pl.Int64,
+    "yes_ask_high": pl.Int64,
+    "yes_ask_close": pl.Int64,
+    "volume": pl.Int64,
+    "open_interest": pl.Int64,
+    "series_ticker": pl.String,
+    "ticker": pl.String,
+}
+
+
+def decode_candlesticks(body: bytes, series_ticker: str, ticker: str) -> pl.DataFrame:
+    # Decode the response bytes straight into typed columns with the Rust JSON reader
+    return (
+        pl.read_json(io.BytesIO(body), schema=CANDLESTICKS_RESPONSE_SCHEMA)
+        .explode("candlesticks")
+        .unnest("candlesticks")
+        # Empty responses explode to a single null row
+        .filter(pl.col("end_period_ts").is_not_null())
+        .select(
+            "end_period_ts",
+            *[
+                pl.col(side).struct.field(field).alias(f"{side}_{field}")
+                for side in ["yes_bid", "yes_ask"]
+                for field in ["open", "low", "high", "close"]
+            ],
+            "volume",
+            "open_interest",
+            pl.lit(series_ticker, pl.String).alias("series_ticker"),
+            pl.lit(ticker, pl.String).alias("ticker"),
+        )
+    )
+
+
+class RateLimiter:
+    def __init__(self, max_requests_per_second: float) -> None:
+        self.interval = 1 / max_requests_per_second
+        self.next_request_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        # Reserve the next free slot, then sleep outside the lock
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_request_time - now
+            self.next_request_time = max(self.next_request_time, now) + self.interval
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+class RequestStats:
+    def __init__(self) -> None:
+        self.stats: dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+    def record(self, endpoint: str, latency: float, retries: int, failed: bool) -> None:
+        with self.lock:
+            stats = self.stats.setdefault(
+                endpoint,
+                {
+                    "requests": 0,
+                    "retries": 0,
+                    "failures": 0,
+                    "total_latency": 0.0,
+                    "max_latency": 0.0,
+                },
+            )
+            stats["requests"] += 1
+            stats["retries"] += retries
+            stats["failures"] += int(failed)
+            stats["total_latency"] += latency
+            stats["max_latency"] = max(stats["max_latency"], latency)
+
+    def to_dataframe(self) -> pl.DataFrame:
+        with self.lock:
+            rows = [{"endpoint": endpoint, **stats} for endpoint, stats in self.stats.items()]
+
+        schema = {
+            "endpoint": pl.String,
+            "requests": pl.Int64,
+            "retries": pl.Int64,
+            "failures": pl.Int64,
+            "total_latency": pl.Float64,
+            "max_latency": pl.Float64,
+        }
+
+        return pl.DataFrame(rows, schema=schema).with_columns(
+            pl.col("total_latency").truediv("requests").alias("mean_latency")
+        )
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    # Retry-After is either a number of seconds or an HTTP date
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((retry_at - dt.datetime.now(dt.timezone.utc)).total_seconds(), 0.0)
+
 
 class KalshiClient:
-    def __init__(self, api_key_id: str, private_key_pem: str) -> None:
+    def __init__(
+        self,
+        api_key_id: str,
+        private_key_pem: str,
+        base_url: str = BASE_URL,
+        max_requests_per_second: float = 10,
+        pool_size: int = 16,
+        connect_timeout: float = 5,
+        read_timeout: float = 30,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+        cache: ResponseCache | None = None,
+        settled_markets_ttl: float = 60 * 60,
+        open_markets_ttl: float = 60,
+        max_candles_per_request: int = 5000,
+        max_chunk_workers: int = 4,
+    ) -> None:
         self.api_key_id = api_key_id
         self.private_key_pem = private_key_pem
-
-    def get_markets(
+        self.base_url = base_url
+        self.rate_limiter = RateLimiter(max_requests_per_second)
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.request_stats = RequestStats()
+        self.cache = cache
+        self.settled_markets_ttl = settled_markets_ttl
+        self.open_markets_ttl = open_markets_ttl
+        self.max_candles_per_request = max_candles_per_request
+        self.max_chunk_workers = max_chunk_workers
+
+        # Keep-alive connection pool shared by every request (and thread)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+
+    def _get(
+        self, endpoint: str, params: dict, stats_key: str, ttl: float | None
+    ) -> bytes:
+        # ttl=None means the response never changes and is cached permanently
+        if self.cache is None:
+            return self._request(endpoint, params, stats_key).content
+
+        key = make_cache_key(endpoint, params)
+        body = self.cache.get(key)
+
+        if body is None:
+            body = self._request(endpoint, params, stats_key).content
+            self.cache.set(key, body, ttl)
+
+        return body
+
+    def _request(
+        self, endpoint: str, params: dict, stats_key: str
+    ) -> requests.Response:
+        url = self.base_url + endpoint
+        start = time.perf_counter()
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+
+            retry_after = None
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    self.request_stats.record(
+                        stats_key, time.perf_counter() - start, attempt, failed=True
+                    )
+                    raise
+            else:
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt == self.max_retries
+                ):
+                    failed = not response.ok
+                    self.request_stats.record(
+                        stats_key, time.perf_counter() - start, attempt, failed
+                    )
+                    response.raise_for_status()
+                    return response
+
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+
+            # Exponential backoff with full jitter unless the server says otherwise
+            if retry_after is None:
+                retry_after = random.uniform(
+                    0, min(self.max_backoff, self.backoff_factor * 2**attempt)
+                )
+
+            time.sleep(retry_after)
+
+    def get_request_stats(self) -> pl.DataFrame:
+        return self.request_stats.to_dataframe()
+
+    def get_cache_stats(self) -> dict | None:
+        return self.cache.get_stats() if self.cache is not None else None
+
+    def iter_markets(
         self,
         event_ticker: str | None = None,
         series_ticker: str | None = None,
@@ -22,7 +283,7 @@ class KalshiClient:
         min_close_ts: dt.datetime | None = None,
         status: str | None = None,  # settled = closed, open = active
         tickers: list[str] | None = None,
-    ) -> pl.DataFrame:
+    ) -> Iterator[pl.DataFrame]:
         endpoint = "markets/"
 
         params = {"limit": 1000}
@@ -40,23 +301,9 @@ class KalshiClient:
         if tickers is not None:
             params["tickers"] = tickers
 
-        url = BASE_URL + endpoint
-
-        columns = [
-            "ticker",
-            "event_ticker",
-            "title",
-            "expected_expiration_time",
-            "status",
-            "yes_bid",
-            "yes_ask",
-            "no_bid",
-            "no_ask",
-            "volume",
-            "result",
-        ]
+        # Listings keep changing as markets settle, so they always expire
+        ttl = self.settled_markets_ttl if status == "settled" else self.open_markets_ttl
 
-        all_markets = []
         cursor = None
 
         while True:
@@ -65,16 +312,22 @@ class KalshiClient:
                 params["cursor"] = cursor
 
             try:
-                response = requests.get(url, params=params)
-                response.raise_for_status()
+                body = self._get(endpoint, params, "markets", ttl)
             except requests.RequestException as e:
                 raise Exception(f"Failed to fetch markets: {e}")
 
-            data = response.json()
+            data = json.loads(body)
             markets = data.get("markets", [])
 
+            # Build each page column by column against a fixed schema
             if markets:
-                all_markets.extend(markets)
+                columns = {
+                    col: [market.get(col) for market in markets]
+                    for col in MARKETS_API_COLUMNS
+                }
+                columns["series_ticker"] = [series_ticker] * len(markets)
+
+                yield pl.DataFrame(columns, schema=MARKETS_SCHEMA)
 
             # Continue if we got a full page (indicating there might be more)
             if len(markets) < params["limit"]:
@@ -87,65 +340,179 @@ class KalshiClient:
             if cursor is None:
                 break
 
-        # Create DataFrame from all collected markets
-        if all_markets:
-            df = pl.DataFrame(all_markets).select(
-                *columns, pl.lit(series_ticker).alias("series_ticker")
-            )
-        else:
-            df = pl.DataFrame(schema={col: pl.Utf8 for col in columns + ["series_ticker"]})
+    def get_markets(
+        self,
+        event_ticker: str | None = None,
+        series_ticker: str | None = None,
+        max_close_ts: dt.datetime | None = None,
+        min_close_ts: dt.datetime | None = None,
+        status: str | None = None,  # settled = closed, open = active
+        tickers: list[str] | None = None,
+    ) -> pl.DataFrame:
+        pages = self.iter_markets(
+            event_ticker=event_ticker,
+            series_ticker=series_ticker,
+            max_close_ts=max_close_ts,
+            min_close_ts=min_close_ts,
+            status=status,
+            tickers=tickers,
+        )
 
-        return df
+        return pl.concat(
+            [pl.DataFrame(schema=MARKETS_SCHEMA), *pages], rechunk=True
+        )
 
-    def get_market_candlesticks(
+    def _get_candlesticks_chunk(
         self,
         series_ticker: str,
         ticker: str,
-        start_ts: dt.datetime,
-        end_ts: dt.datetime,
-        period_interval: int,  # 1 = minutes
+        start_ts: int,
+        end_ts: int,
+        period_interval: int,
     ) -> pl.DataFrame:
         endpoint = f"series/{series_ticker}/markets/{ticker}/candlesticks"
 
         params = {
-            "start_ts": int(start_ts.timestamp()),
-            "end_ts": int(end_ts.timestamp()),
+            "start_ts": start_ts,
+            "end_ts": end_ts,
             "period_interval": period_interval,
         }
 
-        url = BASE_URL + endpoint
+        # Candles for periods that have already ended never change
+        period_end = params["end_ts"] + period_interval * 60
+        ttl = None if period_end <= time.time() else self.open_markets_ttl
 
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
+            body = self._get(endpoint, params, "candlesticks", ttl)
         except requests.RequestException as e:
             raise Exception(f"Failed to fetch candlesticks: {e}")
 
-        candlesticks = [
-            {
-                "end_period_ts": candlestick["end_period_ts"],
-                "yes_bid_open": candlestick["yes_bid"]["open"],
-                "yes_bid_low": candlestick["yes_bid"]["low"],
-                "yes_bid_high": candlestick["yes_bid"]["high"],
-                "yes_bid_close": candlestick["yes_bid"]["open"],
-                "yes_ask_open": candlestick["yes_ask"]["open"],
-                "yes_ask_low": candlestick["yes_ask"]["low"],
-                "yes_ask_high": candlestick["yes_ask"]["high"],
-                "yes_ask_close": candlestick["yes_ask"]["open"],
-                "volume": candlestick["volume"],
-                "open_interest": candlestick["open_interest"],
-            }
-            for candlestick in response.json()["candlesticks"]
+        return decode_candlesticks(body, series_ticker, ticker)
+
+    def _get_windows(
+        self, start_ts: dt.datetime, end_ts: dt.datetime, period_interval: int
+    ) -> list[tuple[int, int]]:
+        start = int(start_ts.timestamp())
+        end = int(end_ts.timestamp())
+
+        # Split into windows the API returns in full
+        span = self.max_candles_per_request * period_interval * 60
+        return [
+            (chunk_start, min(chunk_start + span, end))
+            for chunk_start in range(start, end, span)
+        ] or [(start, end)]
+
+    @staticmethod
+    def _combine_chunks(chunks: list[pl.DataFrame]) -> pl.DataFrame:
+        if len(chunks) == 1:
+            return chunks[0]
+
+        # Adjacent windows share their boundary candle
+        return (
+            pl.concat(chunks)
+            .unique(subset="end_period_ts", keep="first", maintain_order=True)
+            .sort("end_period_ts")
+        )
+
+    def get_market_candlesticks(
+        self,
+        series_ticker: str,
+        ticker: str,
+        start_ts: dt.datetime,
+        end_ts: dt.datetime,
+        period_interval: int,  # 1 = minutes
+    ) -> pl.DataFrame:
+        windows = self._get_windows(start_ts, end_ts, period_interval)
+
+        def fetch(window: tuple[int, int]) -> pl.DataFrame:
+            return self._get_candlesticks_chunk(
+                series_ticker, ticker, *window, period_interval
+            )
+
+        if len(windows) == 1:
+            return fetch(windows[0])
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(windows), self.max_chunk_workers)
+        ) as executor:
+            return self._combine_chunks(list(executor.map(fetch, windows)))
+
+    def get_markets_candlesticks(
+        self,
+        markets: list[dict],
+        period_interval: int,
+        max_workers: int = 1,
+    ) -> tuple[pl.DataFrame, dict[str, str]]:
+        # Each market needs series_ticker, ticker, start_ts and end_ts.
+        # Transient errors are already retried per request in _request
+        windows = [
+            self._get_windows(market["start_ts"], market["end_ts"], period_interval)
+            for market in markets
+        ]
+
+        # Every window of every market is one task on a single pool, so at most
+        # max_workers requests are in flight however long the ranges are
+        tasks = [
+            (i, j)
+            for i, market_windows in enumerate(windows)
+            for j in range(len(market_windows))
         ]
 
-        df = pl.DataFrame(candlesticks).with_columns(
-            pl.lit(series_ticker).alias("series_ticker"), pl.lit(ticker).alias("ticker")
+        def fetch(task: tuple[int, int]) -> pl.DataFrame:
+            i, j = task
+            return self._get_candlesticks_chunk(
+                markets[i]["series_ticker"],
+                markets[i]["ticker"],
+                *windows[i][j],
+                period_interval,
+            )
+
+        chunks: list[list[pl.DataFrame | None]] = [
+            [None] * len(market_windows) for market_windows in windows
+        ]
+        failures = {}
+
+        if max_workers == 1:
+            for i, j in tqdm(tasks, "Downloading historical data."):
+                # The rest of a failed market's windows are not worth fetching
+                if markets[i]["ticker"] in failures:
+                    continue
+
+                try:
+                    chunks[i][j] = fetch((i, j))
+                except Exception as e:
+                    failures[markets[i]["ticker"]] = str(e)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(fetch, task): task for task in tasks}
+                for future in tqdm(
+                    as_completed(futures),
+                    "Downloading historical data.",
+                    total=len(futures),
+                ):
+                    i, j = futures[future]
+                    try:
+                        chunks[i][j] = future.result()
+                    except Exception as e:
+                        failures.setdefault(markets[i]["ticker"], str(e))
+
+        # A market fails as a whole if any of its windows failed. Concatenate in
+        # input order so output matches the serial path
+        candlesticks_list = [
+            self._combine_chunks(market_chunks)
+            for market, market_chunks in zip(markets, chunks)
+            if market["ticker"] not in failures
+        ]
+        candlesticks = pl.concat(
+            [pl.DataFrame(schema=CANDLESTICKS_SCHEMA), *candlesticks_list], rechunk=True
         )
 
-        return df
+        return candlesticks, failures
 
 
 def _create_kalshi_client():
+    load_dotenv(override=True)
+
     kalshi_api_key = os.getenv("KALSHI_API_KEY")
     private_key_path = os.getenv("KALSHI_PRIVATE_KEY_PATH", "kalshi-api-key.txt")
 
@@ -158,7 +525,20 @@ def _create_kalshi_client():
     except FileNotFoundError:
         raise FileNotFoundError(f"Private key file not found at: {private_key_path}")
 
-    return KalshiClient(kalshi_api_key, private_key)
+    cache_path = os.getenv("KALSHI_CACHE_PATH")
+    cache = ResponseCache(cache_path) if cache_path else None
+
+    return KalshiClient(kalshi_api_key, private_key, cache=cache)
+
+
+@functools.cache
+def get_kalshi_client() -> KalshiClient:
+    # Built on first use so importing this module needs no credentials
+    return _create_kalshi_client()
 
 
-kalshi_client = _create_kalshi_client()
+def __getattr__(name: str):
+    # Keep `from nt_research.kalshi import kalshi_client` working lazily
+    if name == "kalshi_client":
+        return get_kalshi_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,201 @@
+import hashlib
+import inspect
+import io
+import json
+import multiprocessing
+import os
+import warnings
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+import polars as pl
+from nt_research.code_version import get_function_id
+from nt_research.storage import read_json, write_json_atomic
+
+if TYPE_CHECKING:
+    from great_tables import GT
+    from matplotlib.figure import Figure
+
+MANIFEST_FILE_NAME = ".render_manifest.json"
+
+# (chart function, keyword arguments including file_name)
+ChartJob = tuple[Callable[..., "Figure"], dict]
+
+WEB_DRIVERS = ("chrome", "firefox")
+
+
+def new_figure(file_name: str | None, **kwargs) -> "Figure":
+    # Figures that are only saved stay off pyplot, so they are safe to build in
+    # workers. Displayed ones need pyplot's window manager
+    if file_name is None:
+        import matplotlib.pyplot as plt
+
+        return plt.figure(**kwargs)
+
+    from matplotlib.figure import Figure
+
+    return Figure(**kwargs)
+
+
+def save_figure(fig: "Figure", file_name: str | None, **kwargs) -> "Figure":
+    # Save when given a file name, otherwise display like plt.show() did
+    if file_name is not None:
+        fig.savefig(file_name, **{"dpi": 300, **kwargs})
+    else:
+        import matplotlib.pyplot as plt
+
+        plt.show()
+
+    return fig
+
+
+def _hash_value(hasher, value) -> None:
+    match value:
+        case pl.DataFrame():
+            buffer = io.BytesIO()
+            value.write_ipc(buffer, compression="uncompressed")
+            hasher.update(buffer.getvalue())
+
+        case pl.Series():
+            _hash_value(hasher, value.to_frame())
+
+        case _:
+            hasher.update(json.dumps(value, sort_keys=True, default=repr).encode())
+
+
+def get_render_key(function: Callable, kwargs: dict) -> str:
+    # Function source stands in for the code version, the id is path based so
+    # running an experiment as a script keys the same as importing it
+    hasher = hashlib.sha256()
+    hasher.update(get_function_id(function).encode())
+    hasher.update(inspect.getsource(function).encode())
+
+    for name in sorted(kwargs):
+        if name == "file_name":
+            continue
+
+        hasher.update(name.encode())
+        _hash_value(hasher, kwargs[name])
+
+    return hasher.hexdigest()
+
+
+def _render(function: Callable, kwargs: dict) -> str:
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+    function(**kwargs)
+
+    return kwargs["file_name"]
+
+
+def render_charts(
+    jobs: list[ChartJob], max_workers: int | None = None, force: bool = False
+) -> list[str]:
+    # Skip artifacts whose function source and inputs are unchanged
+    manifests = {}
+    pending = []
+
+    for function, kwargs in jobs:
+        file_name = kwargs["file_name"]
+        folder, base_name = os.path.split(file_name)
+        manifest = manifests.setdefault(
+            folder, read_json(os.path.join(folder, MANIFEST_FILE_NAME))
+        )
+        key = get_render_key(function, kwargs)
+
+        if not force and manifest.get(base_name) == key and os.path.exists(file_name):
+            continue
+
+        pending.append((function, kwargs, key))
+
+    if not pending:
+        return []
+
+    # One figure per worker, spawned so workers start without pyplot state
+    rendered = []
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers or os.cpu_count(), len(pending)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = [
+                (executor.submit(_render, function, kwargs), kwargs["file_name"], key)
+                for function, kwargs, key in pending
+            ]
+
+            for future, file_name, key in futures:
+                future.result()
+
+                folder, base_name = os.path.split(file_name)
+                manifests[folder][base_name] = key
+                rendered.append(file_name)
+
+    finally:
+        # Record whatever finished so a failed job does not re-render the rest
+        for folder, manifest in manifests.items():
+            write_json_atomic(manifest, os.path.join(folder, MANIFEST_FILE_NAME))
+
+    return rendered
+
+
+def _keep_open(driver_class: type) -> type:
+    # GT.save enters a driver it is given and selenium quits the driver on
+    # exit, so the shared session skips that and save_tables quits it once
+    class KeepOpenDriver(driver_class):
+        def __exit__(self, *exc_info) -> None:
+            pass
+
+    return KeepOpenDriver
+
+
+def _open_web_driver(web_driver: str):
+    from selenium import webdriver
+
+    # Same options GT.save uses when it starts its own browser
+    match web_driver:
+        case "chrome":
+            options = webdriver.ChromeOptions()
+            options.add_argument("--headless=new")
+            return _keep_open(webdriver.Chrome)(options)
+
+        case "firefox":
+            options = webdriver.FirefoxOptions()
+            options.add_argument("--headless")
+            return _keep_open(webdriver.Firefox)(options)
+
+        case _:
+            raise ValueError(f"Unsupported web driver: {web_driver}")
+
+
+def save_tables(tables: list[tuple["GT", str]], web_driver: str = "chrome") -> None:
+    # .html needs no browser, image formats share one headless session
+    screenshots = []
+
+    for gt, file_name in tables:
+        if file_name.endswith(".html"):
+            gt.write_raw_html(file_name, make_page=True)
+        else:
+            screenshots.append((gt, file_name))
+
+    if not screenshots:
+        return
+
+    from selenium.common.exceptions import WebDriverException
+
+    try:
+        driver = _open_web_driver(web_driver)
+    except WebDriverException as e:
+        # No browser on this machine, keep the tables as HTML instead of failing
+        warnings.warn(f"{web_driver} unavailable ({e}), writing HTML tables instead")
+        for gt, file_name in screenshots:
+            gt.write_raw_html(f"{os.path.splitext(file_name)[0]}.html", make_page=True)
+        return
+
+    try:
+        for gt, file_name in screenshots:
+            gt.save(file_name, web_driver=driver)
+
+    finally:
+        driver.quit()
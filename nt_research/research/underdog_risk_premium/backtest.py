@@ -0,0 +1,230 @@
+import itertools
+import polars as pl
+from nt_research.datasets.history import scan_history
+
+# Kalshi trading fee: ceil(rate * contracts * P * (1 - P)) to the next cent
+TAKER_FEE_RATE = 0.07
+MAKER_FEE_RATE = 0.0175
+
+SPEC_SCHEMA = {
+    "strategy_id": pl.Int64,
+    "price_min": pl.Int64,
+    "price_max": pl.Int64,
+    "entry_time": pl.Int64,  # elapsed minutes relative to kickoff
+    "sizing": pl.String,  # "contracts" or "notional" (dollars)
+    "size": pl.Float64,
+    "fee_rate": pl.Float64,
+}
+
+
+def make_specs(
+    price_bands: list[tuple[int, int]],
+    entry_times: list[int],
+    sizings: list[tuple[str, float]] = (("contracts", 1.0),),
+    fee_rates: list[float] = (TAKER_FEE_RATE,),
+) -> pl.DataFrame:
+    # Full grid of strategy specs
+    rows = [
+        {
+            "price_min": price_min,
+            "price_max": price_max,
+            "entry_time": entry_time,
+            "sizing": sizing,
+            "size": size,
+            "fee_rate": fee_rate,
+        }
+        for (price_min, price_max), entry_time, (sizing, size), fee_rate in (
+            itertools.product(price_bands, entry_times, sizings, fee_rates)
+        )
+    ]
+
+    schema = {col: dtype for col, dtype in SPEC_SCHEMA.items() if col != "strategy_id"}
+
+    return (
+        pl.DataFrame(rows, schema=schema)
+        .with_row_index("strategy_id")
+        .cast(SPEC_SCHEMA)
+    )
+
+
+def get_first_touches(
+    history: pl.LazyFrame, entry_times: list[int], entry_window: int
+) -> pl.LazyFrame:
+    # First candle at each ask price per ticker in (entry_time, entry_time + entry_window]
+    candles = history.select(
+        "ticker",
+        "end_period_ts",
+        "yes_ask_close",
+        "game_start_time_utc",
+        pl.col("result").replace({"yes": "1", "no": "0"}).cast(pl.Int8),
+        pl.col("end_period_ts")
+        .sub(pl.col("game_start_time_utc"))
+        .dt.total_minutes()
+        .alias("elapsed_time"),
+    ).filter(pl.col("yes_ask_close").is_between(1, 99))
+
+    windows = pl.LazyFrame({"entry_time": entry_times}, schema={"entry_time": pl.Int64})
+
+    return (
+        candles.join_where(
+            windows,
+            pl.col("elapsed_time") > pl.col("entry_time"),
+            pl.col("elapsed_time") <= pl.col("entry_time") + entry_window,
+        )
+        .group_by("ticker", "entry_time", "yes_ask_close")
+        .agg(
+            pl.col("end_period_ts", "elapsed_time", "game_start_time_utc", "result")
+            .sort_by("end_period_ts")
+            .first()
+        )
+    )
+
+
+def run_backtest(
+    history: pl.LazyFrame | pl.DataFrame,
+    specs: pl.DataFrame,
+    entry_window: int = 60,
+) -> tuple[pl.DataFrame, pl.DataFrame, pl.DataFrame]:
+    first_touches = get_first_touches(
+        history.lazy(), specs["entry_time"].unique().to_list(), entry_window
+    )
+
+    # Entry only depends on the band and entry time, so resolve it once per band.
+    # Entry is the first candle in the window whose ask is inside the band, which
+    # matches the first-entry trades experiment_3 evaluates.
+    bands = (
+        specs.lazy()
+        .select("entry_time", "price_min", "price_max")
+        .unique()
+        .with_row_index("band_id")
+    )
+
+    entries = (
+        bands.join(
+            first_touches.select(
+                "ticker", "entry_time", "yes_ask_close", "end_period_ts"
+            ),
+            on="entry_time",
+            how="inner",
+        )
+        .filter(pl.col("yes_ask_close").is_between("price_min", "price_max"))
+        .group_by("band_id", "ticker")
+        .agg(pl.col("yes_ask_close").get(pl.col("end_period_ts").arg_min()))
+    )
+
+    # Every spec against its band's entries, in one columnar pass
+    trades = (
+        specs.lazy()
+        .join(bands, on=["entry_time", "price_min", "price_max"], how="inner")
+        .join(entries, on="band_id", how="inner")
+        .join(first_touches, on=["ticker", "entry_time", "yes_ask_close"], how="inner")
+        .with_columns(
+            pl.when(pl.col("sizing").eq("notional"))
+            .then(pl.col("size").mul(100).truediv("yes_ask_close").floor())
+            .otherwise(pl.col("size"))
+            .alias("contracts"),
+            pl.col("yes_ask_close").truediv(100).alias("price"),
+        )
+        .filter(pl.col("contracts").gt(0))
+        .with_columns(
+            # Rounding first keeps exact cent amounts from ceiling up on float error
+            pl.col("fee_rate")
+            .mul("contracts")
+            .mul(pl.col("price"))
+            .mul(pl.lit(1).sub("price"))
+            .mul(100)
+            .round(6)
+            .ceil()
+            .truediv(100)
+            .alias("fee"),
+        )
+        .with_columns(
+            pl.col("contracts").mul("price").add(pl.col("fee")).alias("cost"),
+            pl.when(pl.col("result").eq(1))
+            .then(pl.col("contracts").mul(pl.lit(1).sub("price")))
+            .otherwise(pl.col("contracts").mul("price").mul(-1))
+            .sub("fee")
+            .alias("profit"),
+        )
+        .with_columns(
+            pl.col("profit").truediv("cost").alias("return"),
+            pl.col("game_start_time_utc")
+            .dt.convert_time_zone("America/Denver")
+            .dt.date()
+            .alias("date"),
+        )
+        .select(
+            "strategy_id",
+            "ticker",
+            "date",
+            "end_period_ts",
+            "elapsed_time",
+            "yes_ask_close",
+            "result",
+            "contracts",
+            "fee",
+            "cost",
+            "profit",
+            "return",
+        )
+        .sort("strategy_id", "date", "ticker")
+        .collect()
+    )
+
+    # Daily equity curves, same definitions as experiment_4.get_strategy_returns
+    equity = (
+        trades.group_by("strategy_id", "date")
+        .agg(
+            pl.col("return").mean(),
+            pl.col("profit").sum(),
+            pl.col("cost").sum(),
+            pl.len().alias("count"),
+        )
+        .sort("strategy_id", "date")
+        .with_columns(
+            pl.col("return")
+            .add(1)
+            .cum_prod()
+            .sub(1)
+            .over("strategy_id")
+            .alias("cumulative_return"),
+            pl.col("profit").cum_sum().over("strategy_id").alias("cumulative_profit"),
+        )
+        .with_columns(
+            pl.col("cumulative_return")
+            .sub(pl.col("cumulative_return").cum_max().over("strategy_id"))
+            .alias("drawdown")
+        )
+    )
+
+    # Vectorized calculate_performance_metrics for every strategy at once
+    metrics = (
+        equity.group_by("strategy_id")
+        .agg(
+            (pl.col("return").mean() * 16**0.5 / pl.col("return").std(ddof=0)).alias(
+                "sharpe"
+            ),
+            (pl.col("return").mean() * 16 / pl.col("drawdown").min().abs()).alias(
+                "calmar"
+            ),
+            pl.col("drawdown").min().alias("max_drawdown"),
+            pl.col("profit").sum().alias("total_profit"),
+            pl.col("count").sum().alias("trades"),
+        )
+        .join(specs, on="strategy_id", how="left")
+        .sort("strategy_id")
+    )
+
+    return trades, equity, metrics
+
+
+if __name__ == "__main__":
+    specs = make_specs(
+        price_bands=[(price_min, 99) for price_min in range(50, 99)],
+        entry_times=list(range(-180, 1, 15)),
+        sizings=[("contracts", 1.0), ("notional", 100.0)],
+    )
+
+    trades, equity, metrics = run_backtest(scan_history(), specs)
+
+    print(metrics.sort("sharpe", descending=True, nulls_last=True))
@@ -0,0 +1,221 @@
+import hashlib
+import os
+import uuid
+import polars as pl
+import nt_research.research.underdog_risk_premium.data_utils as du
+from nt_research.datasets.history import GAME_DATE_TIME_ZONE, scan_history
+from nt_research.storage import PartStore, write_parquet_atomic
+
+CALIBRATION_STATE_DIR = "data/cache/calibration_state"
+
+STATE_KEYS = ["game_date", "price_bin", "time_bin"]
+
+# Additive sufficient statistics, so states from any ticker split sum exactly
+STATE_SCHEMA = {
+    "game_date": pl.Date,
+    "price_bin": pl.String,
+    "time_bin": pl.String,
+    "count": pl.Int64,
+    "price_sum": pl.Float64,
+    "price_sq_sum": pl.Float64,
+    "result_sum": pl.Float64,
+    "result_sq_sum": pl.Float64,
+    "elapsed_time_sum": pl.Float64,
+}
+
+SUM_COLUMNS = [col for col in STATE_SCHEMA if col not in STATE_KEYS]
+
+MANIFEST_SCHEMA = {"ticker": pl.String, "part": pl.String}
+
+
+def get_state(trades: pl.LazyFrame, game_dates: pl.LazyFrame) -> pl.DataFrame:
+    return (
+        trades.join(game_dates, on="ticker", how="inner")
+        .group_by(STATE_KEYS)
+        .agg(
+            pl.len().cast(pl.Int64).alias("count"),
+            pl.col("yes_ask_close").sum().alias("price_sum"),
+            pl.col("yes_ask_close").pow(2).sum().alias("price_sq_sum"),
+            pl.col("result").sum().alias("result_sum"),
+            pl.col("result").pow(2).sum().alias("result_sq_sum"),
+            pl.col("elapsed_time").sum().alias("elapsed_time_sum"),
+        )
+        .collect()
+        .cast(STATE_SCHEMA)
+        .sort(STATE_KEYS)
+    )
+
+
+def merge_states(states: list[pl.DataFrame]) -> pl.DataFrame:
+    return (
+        pl.concat([pl.DataFrame(schema=STATE_SCHEMA), *states])
+        .group_by(STATE_KEYS)
+        .agg(pl.col(SUM_COLUMNS).sum())
+        .sort(STATE_KEYS)
+    )
+
+
+def _get_stats(sums: pl.LazyFrame) -> pl.LazyFrame:
+    # Same columns as experiment_2.get_results, from sums instead of trades
+    return (
+        sums.with_columns(
+            pl.col("elapsed_time_sum").truediv("count").alias("trade_time_mean"),
+            pl.col("price_sum").truediv("count").alias("price_mean"),
+            pl.col("result_sum").truediv("count").mul(100).alias("result_mean"),
+            pl.col("result_sq_sum")
+            .sub(pl.col("result_sum").pow(2).truediv("count"))
+            .truediv(pl.col("count").sub(1))
+            .clip(lower_bound=0)
+            .sqrt()
+            .mul(100)
+            .alias("result_stdev"),
+        )
+        .with_columns(
+            pl.col("result_mean").sub("price_mean").alias("delta"),
+            (
+                (pl.col("result_mean") - pl.col("price_mean"))
+                / (pl.col("result_stdev") / pl.col("count").sqrt())
+            ).alias("tstat"),
+        )
+        .drop(SUM_COLUMNS[1:])
+    )
+
+
+def get_calibration(
+    state: pl.DataFrame, by: list[str] = ("price_bin", "time_bin")
+) -> pl.DataFrame:
+    return (
+        _get_stats(state.lazy().group_by(*by).agg(pl.col(SUM_COLUMNS).sum()))
+        .sort("trade_time_mean", "price_mean")
+        .collect()
+    )
+
+
+def get_expanding_calibration(
+    state: pl.DataFrame, by: list[str] = ("price_bin", "time_bin")
+) -> pl.DataFrame:
+    # Calibration through each game date, for drift over a season
+    return (
+        _get_stats(
+            state.lazy()
+            .group_by("game_date", *by)
+            .agg(pl.col(SUM_COLUMNS).sum())
+            .sort("game_date")
+            .with_columns(pl.col(SUM_COLUMNS).cum_sum().over(*by))
+        )
+        .sort(*by, "game_date")
+        .collect()
+    )
+
+
+def get_rolling_calibration(
+    state: pl.DataFrame,
+    window: str = "28d",
+    by: list[str] = ("price_bin", "time_bin"),
+) -> pl.DataFrame:
+    # Calibration over the trailing window ending at each game date
+    return (
+        _get_stats(
+            state.lazy()
+            .group_by("game_date", *by)
+            .agg(pl.col(SUM_COLUMNS).sum())
+            .sort(*by, "game_date")
+            .rolling("game_date", period=window, group_by=list(by))
+            .agg(pl.col(SUM_COLUMNS).sum())
+        )
+        .sort(*by, "game_date")
+        .collect()
+    )
+
+
+class CalibrationStore(PartStore):
+    def __init__(
+        self,
+        min_elapsed_time: int,
+        max_elapsed_time: int,
+        time_interval: int,
+        root: str = CALIBRATION_STATE_DIR,
+    ) -> None:
+        self.min_elapsed_time = min_elapsed_time
+        self.max_elapsed_time = max_elapsed_time
+        self.time_interval = time_interval
+
+        # One store per binning, like the trade cube cache
+        params = (
+            f"{min_elapsed_time}:{max_elapsed_time}:{time_interval}:{du.PRICE_BREAKS}"
+        )
+        params_key = hashlib.sha256(params.encode()).hexdigest()[:16]
+        super().__init__(os.path.join(root, params_key), MANIFEST_SCHEMA)
+
+    def read_state(self) -> pl.DataFrame:
+        parts = self.get_manifest()["part"].unique().to_list()
+
+        return merge_states(
+            [pl.read_parquet(self._part_path("state", part)) for part in parts]
+        )
+
+    def update(self, source: str | None = None) -> int:
+        # Fold in only tickers the manifest has not seen
+        self.remove_orphan_parts()
+
+        history = scan_history(source=source)
+        manifest = self.get_manifest()
+
+        game_dates = (
+            history.group_by("ticker")
+            .agg(
+                pl.col("game_start_time_utc")
+                .first()
+                .dt.convert_time_zone(GAME_DATE_TIME_ZONE)
+                .dt.date()
+                .alias("game_date")
+            )
+            .join(manifest.lazy(), on="ticker", how="anti")
+            .collect()
+        )
+
+        if game_dates.is_empty():
+            return 0
+
+        new_history = history.join(game_dates.lazy(), on="ticker", how="semi")
+        trades = du.get_trades_lazy(
+            new_history,
+            self.min_elapsed_time,
+            self.max_elapsed_time,
+            self.time_interval,
+        )
+
+        part = uuid.uuid4().hex
+        write_parquet_atomic(
+            get_state(trades, game_dates.lazy()), self._part_path("state", part)
+        )
+
+        # The part only counts once the manifest references it
+        manifest = pl.concat(
+            [manifest, game_dates.select("ticker", pl.lit(part).alias("part"))]
+        )
+        write_parquet_atomic(manifest, self.manifest_path)
+
+        return game_dates.height
+
+    def compact(self) -> None:
+        part = uuid.uuid4().hex
+        write_parquet_atomic(self.read_state(), self._part_path("state", part))
+
+        manifest = self.get_manifest().with_columns(pl.lit(part).alias("part"))
+        write_parquet_atomic(manifest, self.manifest_path)
+
+        self.remove_orphan_parts()
+
+
+if __name__ == "__main__":
+    store = CalibrationStore(
+        min_elapsed_time=-180, max_elapsed_time=180, time_interval=60
+    )
+
+    print(f"Added {store.update()} new tickers.")
+    state = store.read_state()
+
+    pl.Config.set_tbl_rows(-1)
+    print(get_calibration(state))
+    print(get_rolling_calibration(state, by=["price_bin"]))
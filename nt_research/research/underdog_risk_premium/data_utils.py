@@ -1,22 +1,48 @@
+import glob
+import hashlib
+import datetime as dt
+import os
 import polars as pl
 import numpy as np
+from nt_research.code_version import get_code_version
+from nt_research.datasets.history import resolve_history_path, scan_history
 
-def get_trades(
+PRICE_BREAKS = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 99]
+
+TRADE_CUBE_DIR = "data/cache/trade_cube"
+
+
+def get_source_fingerprint(source: str) -> str:
+    # Path, size and mtime of every file backing the history
+    if os.path.isdir(source):
+        pattern = os.path.join(source, "**", "*.parquet")
+        paths = sorted(glob.glob(pattern, recursive=True))
+    else:
+        paths = [source]
+
+    digest = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    return digest.hexdigest()[:16]
+
+
+def get_trades_lazy(
+    lf: pl.LazyFrame,
     min_elapsed_time: int,
     max_elapsed_time: int,
     time_interval: int,
+    price_breaks: list[int] = PRICE_BREAKS,
     time_bin: str | None = None,
     price_bin: str | None = None,
-):
-    df = pl.read_parquet("data/2025-11-11_history.parquet")
-
-    price_breaks = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 99]
+) -> pl.LazyFrame:
     time_breaks = np.arange(
         min_elapsed_time, max_elapsed_time + time_interval, time_interval
     )
 
-    df = (
-        df.select(
+    lf = (
+        lf.select(
             "end_period_ts",
             "ticker",
             "yes_ask_close",
@@ -45,17 +71,127 @@ def get_trades(
             .alias("price_bin"),
             pl.col("elapsed_time").cut(time_breaks).cast(pl.String).alias("time_bin"),
         )
-        # Get ticker values for each bin
-        .sort("ticker", "end_period_ts")
-        .group_by("ticker", "price_bin", "time_bin")
+    )
+
+    # Bins are group keys, so filtering them before grouping is equivalent
+    if time_bin is not None:
+        lf = lf.filter(pl.col("time_bin").eq(time_bin))
+
+    if price_bin is not None:
+        lf = lf.filter(pl.col("price_bin").eq(price_bin))
+
+    return (
+        # Get first ticker values for each bin (order-independent for streaming)
+        lf.group_by("ticker", "price_bin", "time_bin")
         .agg(
-            pl.col("elapsed_time").first(),
-            pl.col("yes_ask_close").first(),
-            pl.col("result").first(),
+            pl.col("elapsed_time", "yes_ask_close", "result")
+            .sort_by("end_period_ts")
+            .first()
         )
         # Remove trades where price is 0 or 100
         .filter(pl.col("yes_ask_close").is_between(1, 99))
-        .sort("ticker")
+    )
+
+
+def build_trade_cube(
+    min_elapsed_time: int,
+    max_elapsed_time: int,
+    time_interval: int,
+    time_bin: str | None = None,
+    price_bin: str | None = None,
+    source: str | None = None,
+    start: dt.datetime | None = None,
+    end: dt.datetime | None = None,
+) -> pl.DataFrame:
+    # start and end bound end_period_ts, pruning history partitions outside them
+    return (
+        get_trades_lazy(
+            scan_history(start=start, end=end, source=source),
+            min_elapsed_time,
+            max_elapsed_time,
+            time_interval,
+            time_bin=time_bin,
+            price_bin=price_bin,
+        )
+        .collect(engine="streaming")
+        .sort("ticker", "time_bin", "price_bin")
+    )
+
+
+def get_trade_cube(
+    min_elapsed_time: int,
+    max_elapsed_time: int,
+    time_interval: int,
+    source: str | None = None,
+    start: dt.datetime | None = None,
+    end: dt.datetime | None = None,
+) -> pl.DataFrame:
+    # Cached ticker x price_bin x time_bin table, rebuilt when the history changes
+    source = source if source is not None else resolve_history_path()
+
+    # One cube per source, binning and time window. The code version and the
+    # source fingerprint pick the live one, any other version of it is stale
+    params = (
+        f"{os.path.abspath(source)}:{min_elapsed_time}:{max_elapsed_time}:"
+        f"{time_interval}:{PRICE_BREAKS}:{start}:{end}"
+    )
+    params_key = hashlib.sha256(params.encode()).hexdigest()[:16]
+    code_version = get_code_version(build_trade_cube)[:16]
+    path = os.path.join(
+        TRADE_CUBE_DIR,
+        f"{params_key}-{code_version}-{get_source_fingerprint(source)}.parquet",
+    )
+
+    if os.path.exists(path):
+        return pl.read_parquet(path)
+
+    cube = build_trade_cube(
+        min_elapsed_time,
+        max_elapsed_time,
+        time_interval,
+        source=source,
+        start=start,
+        end=end,
+    )
+
+    # Replace cubes of this source built from older history or code
+    os.makedirs(TRADE_CUBE_DIR, exist_ok=True)
+    stale_pattern = os.path.join(TRADE_CUBE_DIR, f"{params_key}-*.parquet")
+    for stale_path in glob.glob(stale_pattern):
+        os.remove(stale_path)
+
+    tmp_path = f"{path}.tmp"
+    cube.write_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+    return cube
+
+
+def get_trades(
+    min_elapsed_time: int,
+    max_elapsed_time: int,
+    time_interval: int,
+    time_bin: str | None = None,
+    price_bin: str | None = None,
+    source: str | None = None,
+    use_cache: bool = True,
+    start: dt.datetime | None = None,
+    end: dt.datetime | None = None,
+):
+    if not use_cache:
+        return build_trade_cube(
+            min_elapsed_time,
+            max_elapsed_time,
+            time_interval,
+            time_bin=time_bin,
+            price_bin=price_bin,
+            source=source,
+            start=start,
+            end=end,
+        )
+
+    df = get_trade_cube(
+        min_elapsed_time, max_elapsed_time, time_interval, source, start, end
     )
 
     if time_bin is not None:
@@ -64,4 +200,4 @@ def get_trades(
     if price_bin is not None:
         df = df.filter(pl.col("price_bin").eq(price_bin))
 
-    return df.sort("ticker", "time_bin", "price_bin")
\ No newline at end of file
+    return df
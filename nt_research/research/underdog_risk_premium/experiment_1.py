@@ -1,10 +1,13 @@
 import polars as pl
-import seaborn as sns
-import matplotlib.pyplot as plt
 import os
-from great_tables import GT
 import numpy as np
 import nt_research.research.underdog_risk_premium.data_utils as du
+from typing import TYPE_CHECKING
+from nt_research.rendering import new_figure, render_charts, save_figure, save_tables
+
+if TYPE_CHECKING:
+    from great_tables import GT
+    from matplotlib.figure import Figure
 
 
 def get_results(trades: pl.DataFrame) -> pl.DataFrame:
@@ -31,55 +34,63 @@ def get_results(trades: pl.DataFrame) -> pl.DataFrame:
     )
 
 
+def get_calibration_table(results: pl.DataFrame, title: str | None = None) -> "GT":
+    from great_tables import GT
+
+    return (
+        GT(results)
+        .tab_header(title=title)
+        .fmt_number(
+            columns=[
+                "trade_time_mean",
+                "price_mean",
+                "result_mean",
+                "result_stdev",
+                "delta",
+                "tstat",
+            ],
+            decimals=2,
+        )
+        .cols_label(
+            price_bin="Price Group",
+            trade_time_mean="Trade Time Mean",
+            price_mean="Price Mean",
+            result_mean="Result Mean",
+            result_stdev="Result St. Dev.",
+            count="Count",
+            delta="Delta",
+            tstat="T-stat",
+        )
+        .opt_stylize(style=5, color="gray")
+    )
+
+
 def create_calibration_table(
     results: pl.DataFrame,
     title: str | None = None,
     file_name: str | None = None,
 ) -> pl.DataFrame:
     if file_name is not None:
-        gt = (
-            GT(results)
-            .tab_header(title=title)
-            .fmt_number(
-                columns=[
-                    "trade_time_mean",
-                    "price_mean",
-                    "result_mean",
-                    "result_stdev",
-                    "delta",
-                    "tstat",
-                ],
-                decimals=2,
-            )
-            .cols_label(
-                price_bin="Price Group",
-                trade_time_mean="Trade Time Mean",
-                price_mean="Price Mean",
-                result_mean="Result Mean",
-                result_stdev="Result St. Dev.",
-                count="Count",
-                delta="Delta",
-                tstat="T-stat",
-            )
-            .opt_stylize(style=5, color="gray")
-        )
-        gt.save(file_name)
+        save_tables([(get_calibration_table(results, title), file_name)])
     else:
         print(results)
 
 
 def create_calibration_chart(
     results: pl.DataFrame, title: str, file_name: str | None = None
-) -> None:
-    plt.figure(figsize=(10, 6))
+) -> "Figure":
+    import seaborn as sns
+
+    fig = new_figure(file_name, figsize=(10, 6))
+    ax = fig.subplots()
 
     # Result bars
-    sns.barplot(results, x="price_bin", y="result_mean", color="dimgray")
+    sns.barplot(results, x="price_bin", y="result_mean", color="dimgray", ax=ax)
 
     # Perfect calibration reference line
     x_vals = [(x * 10 + 5) for x in range(10)]
 
-    plt.plot(
+    ax.plot(
         range(len(x_vals)),
         x_vals,
         color="red",
@@ -91,17 +102,13 @@ def create_calibration_chart(
     )
 
     # Format
-    plt.title(title)
-    plt.ylabel("Percentage Won")
-    plt.xlabel("Price Group")
-    plt.legend(loc="upper left")
-    plt.tight_layout()
+    ax.set_title(title)
+    ax.set_ylabel("Percentage Won")
+    ax.set_xlabel("Price Group")
+    ax.legend(loc="upper left")
+    fig.tight_layout()
 
-    # Save/display
-    if file_name is not None:
-        plt.savefig(file_name, dpi=300)
-    else:
-        plt.show()
+    return save_figure(fig, file_name)
 
 
 if __name__ == "__main__":
@@ -136,8 +143,15 @@ if __name__ == "__main__":
         file_name=f"{folder}/calibration_table_t={trade_time}.png",
     )
 
-    create_calibration_chart(
-        results,
-        title=f"Contract Calibration (t={trade_time})",
-        file_name=f"{folder}/calibration_chart_t={trade_time}.png",
+    render_charts(
+        [
+            (
+                create_calibration_chart,
+                dict(
+                    results=results,
+                    title=f"Contract Calibration (t={trade_time})",
+                    file_name=f"{folder}/calibration_chart_t={trade_time}.png",
+                ),
+            )
+        ]
     )
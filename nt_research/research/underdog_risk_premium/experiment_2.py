@@ -1,9 +1,12 @@
 import polars as pl
-import seaborn as sns
-import matplotlib.pyplot as plt
 import os
 import numpy as np
 import nt_research.research.underdog_risk_premium.data_utils as du
+from typing import TYPE_CHECKING
+from nt_research.rendering import new_figure, render_charts, save_figure
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
 def get_results(trades: pl.DataFrame) -> pl.DataFrame:
     return (
@@ -30,13 +33,16 @@ def create_calibration_over_time_chart(
     title: str,
     price_bin: str | None = None,
     file_name: str | None = None,
-) -> None:
+) -> "Figure":
+    import seaborn as sns
+
     if price_bin is not None:
         aggregate_trades = aggregate_trades.filter(
             pl.col("price_bin").eq(price_bin)
         ).sort("trade_time_mean")
 
-    _, ax = plt.subplots(figsize=(10, 6))
+    fig = new_figure(file_name, figsize=(10, 6))
+    ax = fig.subplots()
 
     # Lines
     if price_bin is not None:
@@ -111,13 +117,9 @@ def create_calibration_over_time_chart(
     if price_bin is None:
         ax.legend(title="Price Bin", bbox_to_anchor=(1, 1), loc="upper left")
 
-    plt.tight_layout()
+    fig.tight_layout()
 
-    # Save/display
-    if file_name is not None:
-        plt.savefig(file_name, dpi=300, bbox_inches="tight")
-    else:
-        plt.show()
+    return save_figure(fig, file_name, bbox_inches="tight")
 
 
 def create_count_over_time_chart(
@@ -125,7 +127,9 @@ def create_count_over_time_chart(
     title: str,
     price_bin: str,
     file_name: str | None = None,
-) -> None:
+) -> "Figure":
+    import seaborn as sns
+
     totals = (
         aggregate_trades.group_by("time_bin")
         .agg(pl.col("count").sum(), pl.col("trade_time_mean").mean())
@@ -134,22 +138,23 @@ def create_count_over_time_chart(
 
     aggregate_trades = aggregate_trades.filter(pl.col("price_bin").eq(price_bin))
 
-    plt.figure(figsize=(10, 6))
+    fig = new_figure(file_name, figsize=(10, 6))
+    ax = fig.subplots()
 
     sns.lineplot(
-        aggregate_trades, x="trade_time_mean", y="count", label=f"{price_bin} Count"
+        aggregate_trades,
+        x="trade_time_mean",
+        y="count",
+        label=f"{price_bin} Count",
+        ax=ax,
     )
-    sns.lineplot(totals, x="trade_time_mean", y="count", label="Total")
+    sns.lineplot(totals, x="trade_time_mean", y="count", label="Total", ax=ax)
 
-    plt.title(title)
-    plt.ylabel("Count")
-    plt.xlabel("Mean Elapsed Time")
+    ax.set_title(title)
+    ax.set_ylabel("Count")
+    ax.set_xlabel("Mean Elapsed Time")
 
-    # Save/display
-    if file_name is not None:
-        plt.savefig(file_name, dpi=300)
-    else:
-        plt.show()
+    return save_figure(fig, file_name)
 
 
 def create_tstat_chart(
@@ -157,15 +162,18 @@ def create_tstat_chart(
     title: str,
     price_bin: str | None = None,
     file_name: str | None = None,
-) -> None:
+) -> "Figure":
+    import seaborn as sns
+
     if price_bin is not None:
         aggregate_trades = aggregate_trades.filter(pl.col("price_bin").eq(price_bin))
 
-    plt.figure(figsize=(10, 6))
+    fig = new_figure(file_name, figsize=(10, 6))
+    ax = fig.subplots()
 
     # Lines
     if price_bin is not None:
-        sns.lineplot(aggregate_trades, x="trade_time_mean", y="tstat")
+        sns.lineplot(aggregate_trades, x="trade_time_mean", y="tstat", ax=ax)
 
     else:
         sns.lineplot(
@@ -174,12 +182,13 @@ def create_tstat_chart(
             y="tstat",
             hue="price_bin",
             palette="coolwarm",
+            ax=ax,
         )
 
-    plt.title(title)
-    plt.ylabel("T-Stat")
-    plt.xlabel("Mean Elapsed Time")
-    plt.figtext(
+    ax.set_title(title)
+    ax.set_ylabel("T-Stat")
+    ax.set_xlabel("Mean Elapsed Time")
+    fig.text(
         0.5,
         0.01,
         "T-stats are clipped on [-10, 10]",
@@ -189,17 +198,17 @@ def create_tstat_chart(
     )
 
     if price_bin is None:
-        plt.legend(title="Price Bin", bbox_to_anchor=(1, 1), loc="upper left")
-        plt.tight_layout()
+        ax.legend(title="Price Bin", bbox_to_anchor=(1, 1), loc="upper left")
+        fig.tight_layout()
+
+    return save_figure(fig, file_name)
 
-    # Save/display
-    if file_name is not None:
-        plt.savefig(file_name, dpi=300)
-    else:
-        plt.show()
 
+def create_count_heatmap(
+    trades: pl.DataFrame, file_name: str | None = None
+) -> "Figure":
+    import seaborn as sns
 
-def create_count_heatmap(trades: pl.DataFrame, file_name: str | None = None) -> None:
     counts = (
         trades.filter(pl.col("yes_ask_close").ne(100))
         .group_by("price_bin", "time_bin")
@@ -219,7 +228,8 @@ def create_count_heatmap(trades: pl.DataFrame, file_name: str | None = None) ->
 
     counts_data = counts.drop("price_bin")
 
-    plt.figure(figsize=(10, 8))
+    fig = new_figure(file_name, figsize=(10, 8))
+    ax = fig.subplots()
     sns.heatmap(
         counts_data,
         annot=True,
@@ -228,16 +238,14 @@ def create_count_heatmap(trades: pl.DataFrame, file_name: str | None = None) ->
         xticklabels=counts_data.columns,
         yticklabels=counts["price_bin"].to_list(),
         cbar_kws={"label": "Count"},
+        ax=ax,
     )
-    plt.xlabel("Time Bin")
-    plt.ylabel("Price Bin")
-    plt.title("Trade Count Heatmap")
-    plt.tight_layout()
+    ax.set_xlabel("Time Bin")
+    ax.set_ylabel("Price Bin")
+    ax.set_title("Trade Count Heatmap")
+    fig.tight_layout()
 
-    if file_name is not None:
-        plt.savefig(file_name, dpi=300)
-    else:
-        plt.show()
+    return save_figure(fig, file_name)
 
 
 if __name__ == "__main__":
@@ -261,43 +269,55 @@ if __name__ == "__main__":
     # Get aggregate trades
     results = get_results(trades)
 
-    # Create all bins result
-    create_calibration_over_time_chart(
-        results,
-        title="Calibration Over Time Across Price Bins",
-        file_name=f"{folder}/calibration-over-time-across-bins.png",
-    )
-
-    # Create all bins result
-    create_calibration_over_time_chart(
-        results,
-        price_bin="(90, 99]",
-        title="(90, 99] Bin Calibration Over Time",
-        file_name=f"{folder}/calibration-over-time-top-bin.png",
-    )
-
-    # Create counts chart
-    create_count_over_time_chart(
-        results,
-        price_bin="(90, 99]",
-        title="(90, 99] Bin Count Over Time",
-        file_name=f"{folder}/count-over-time-top-bin.png",
-    )
-
-    # Create tstat chart
-    create_tstat_chart(
-        results,
-        title="T-stat Count Over Time Across Price Bins",
-        file_name=f"{folder}/tstat-over-time.png",
-    )
-
-    # Create tstat chart top bin
-    create_tstat_chart(
-        results,
-        price_bin="(90, 99]",
-        title="(90, 99] T-stat Count Over Time",
-        file_name=f"{folder}/tstat-over-time-top-bin.png",
+    # Render every chart in parallel, skipping unchanged ones
+    render_charts(
+        [
+            (
+                create_calibration_over_time_chart,
+                dict(
+                    aggregate_trades=results,
+                    title="Calibration Over Time Across Price Bins",
+                    file_name=f"{folder}/calibration-over-time-across-bins.png",
+                ),
+            ),
+            (
+                create_calibration_over_time_chart,
+                dict(
+                    aggregate_trades=results,
+                    price_bin="(90, 99]",
+                    title="(90, 99] Bin Calibration Over Time",
+                    file_name=f"{folder}/calibration-over-time-top-bin.png",
+                ),
+            ),
+            (
+                create_count_over_time_chart,
+                dict(
+                    aggregate_trades=results,
+                    price_bin="(90, 99]",
+                    title="(90, 99] Bin Count Over Time",
+                    file_name=f"{folder}/count-over-time-top-bin.png",
+                ),
+            ),
+            (
+                create_tstat_chart,
+                dict(
+                    aggregate_trades=results,
+                    title="T-stat Count Over Time Across Price Bins",
+                    file_name=f"{folder}/tstat-over-time.png",
+                ),
+            ),
+            (
+                create_tstat_chart,
+                dict(
+                    aggregate_trades=results,
+                    price_bin="(90, 99]",
+                    title="(90, 99] T-stat Count Over Time",
+                    file_name=f"{folder}/tstat-over-time-top-bin.png",
+                ),
+            ),
+            (
+                create_count_heatmap,
+                dict(trades=trades, file_name=f"{folder}/counts-heatmap.png"),
+            ),
+        ]
     )
-
-    # Create counts heatmap
-    create_count_heatmap(trades, file_name=f"{folder}/counts-heatmap.png")
@@ -1,7 +1,11 @@
 import polars as pl
 import os
-from great_tables import GT
 import nt_research.research.underdog_risk_premium.data_utils as du
+from typing import TYPE_CHECKING
+from nt_research.rendering import save_tables
+
+if TYPE_CHECKING:
+    from great_tables import GT
 
 
 def get_profits(trades: pl.DataFrame) -> pl.DataFrame:
@@ -29,14 +33,12 @@ def get_lost_trades(trades: pl.DataFrame) -> pl.DataFrame:
     )
 
 
-def create_performance_table(
-    profits: pl.DataFrame, title: str | None = None, file_name: str | None = None
-) -> pl.DataFrame:
+def get_performance(profits: pl.DataFrame) -> pl.DataFrame:
     totals = profits.with_columns(pl.lit("Total").alias("trades_type"))
 
     profits_merge: pl.DataFrame = pl.concat([profits, totals])
 
-    table = (
+    return (
         profits_merge.group_by("trades_type")
         .agg(
             pl.col("elapsed_time").mean(),
@@ -50,28 +52,39 @@ def create_performance_table(
         .sort(by=pl.col("trades_type").replace({"Won": "a", "Lost": "b", "Total": "c"}))
     )
 
-    if file_name is not None:
-        gt = (
-            GT(table)
-            .tab_header(title=title)
-            .fmt_number(
-                columns=["elapsed_time", "count", "profit", "price", "sharpe"],
-                decimals=2,
-            )
-            .fmt_percent(columns=["return_mean", "return_stdev"])
-            .cols_label(
-                trades_type="Trades",
-                elapsed_time="Elapsed Time",
-                count="Count",
-                profit="Profit",
-                price="Price",
-                return_mean="Return Mean",
-                return_stdev="Return Std. Dev.",
-                sharpe="Sharpe",
-            )
-            .opt_stylize(style=5, color="gray")
+
+def get_performance_table(performance: pl.DataFrame, title: str | None = None) -> "GT":
+    from great_tables import GT
+
+    return (
+        GT(performance)
+        .tab_header(title=title)
+        .fmt_number(
+            columns=["elapsed_time", "count", "profit", "price", "sharpe"],
+            decimals=2,
         )
-        gt.save(file_name)
+        .fmt_percent(columns=["return_mean", "return_stdev"])
+        .cols_label(
+            trades_type="Trades",
+            elapsed_time="Elapsed Time",
+            count="Count",
+            profit="Profit",
+            price="Price",
+            return_mean="Return Mean",
+            return_stdev="Return Std. Dev.",
+            sharpe="Sharpe",
+        )
+        .opt_stylize(style=5, color="gray")
+    )
+
+
+def create_performance_table(
+    profits: pl.DataFrame, title: str | None = None, file_name: str | None = None
+) -> pl.DataFrame:
+    table = get_performance(profits)
+
+    if file_name is not None:
+        save_tables([(get_performance_table(table, title), file_name)])
     else:
         print(table)
 
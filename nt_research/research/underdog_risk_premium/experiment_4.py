@@ -1,7 +1,12 @@
 import polars as pl
-import seaborn as sns
-import matplotlib.pyplot as plt
+import numpy as np
 import os
+from typing import TYPE_CHECKING
+from nt_research.datasets.history import scan_history
+from nt_research.rendering import new_figure, render_charts, save_figure
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
 
 def get_strategy_returns(df: pl.DataFrame, price_min: int, price_max: int) -> pl.DataFrame:
@@ -62,47 +67,52 @@ def create_cumulative_return_chart(
     results: pl.DataFrame,
     title: str,
     file_name: str | None = None
-) -> None:
-    plt.figure(figsize=(12, 7))
+) -> 'Figure':
+    import seaborn as sns
+
+    fig = new_figure(file_name, figsize=(12, 7))
+    ax = fig.subplots()
 
     sns.lineplot(
         results,
         x='date',
         y='cumulative_return',
-        color='black'
+        color='black',
+        ax=ax
     )
 
     # Add grid
-    plt.grid(True)
+    ax.grid(True)
 
     # Add zero line
-    plt.axhline(y=0, color='gray', linestyle='-')
+    ax.axhline(y=0, color='gray', linestyle='-')
 
     # Format
-    plt.xlabel(None)
-    plt.ylabel('Cumulative Return (%)')
-    plt.title(title)
+    ax.set_xlabel(None)
+    ax.set_ylabel('Cumulative Return (%)')
+    ax.set_title(title)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
-    if file_name is not None:
-        plt.savefig(file_name, dpi=300, bbox_inches='tight')
-    else:
-        plt.show()
+    return save_figure(fig, file_name, bbox_inches='tight')
 
 
 def create_drawdown_chart(
     results: pl.DataFrame,
     title: str,
     file_name: str | None = None
-) -> None:
-    plt.figure(figsize=(12, 7))
+) -> 'Figure':
+    import seaborn as sns
+
+    fig = new_figure(file_name, figsize=(12, 7))
+    ax = fig.subplots()
 
-    ax = sns.lineplot(
+    sns.lineplot(
         results,
         x='date',
         y='max_drawdown',
-        color='red'
+        color='red',
+        ax=ax
     )
 
     ax.fill_between(
@@ -114,22 +124,19 @@ def create_drawdown_chart(
     )
 
     # Add grid
-    plt.grid(True)
+    ax.grid(True)
 
     # Add zero line
-    # plt.axhline(y=0, color='gray', linestyle='-')
+    # ax.axhline(y=0, color='gray', linestyle='-')
 
     # Format
-    plt.xlabel(None)
-    plt.ylabel('Drawdown (%)')
-    plt.title(title)
+    ax.set_xlabel(None)
+    ax.set_ylabel('Drawdown (%)')
+    ax.set_title(title)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
-    if file_name is not None:
-        plt.savefig(file_name, dpi=300, bbox_inches='tight')
-    else:
-        plt.show()
+    return save_figure(fig, file_name, bbox_inches='tight')
 
 
 def calculate_performance_metrics(results: pl.DataFrame) -> dict:
@@ -149,6 +156,96 @@ def calculate_performance_metrics(results: pl.DataFrame) -> dict:
     }
 
 
+def get_band_surface(
+    df: pl.DataFrame,
+    price_min: int = 1,
+    price_max: int = 99
+) -> pl.DataFrame:
+    # Daily return sums and counts per integer price, same trades as get_strategy_returns
+    buckets = (
+        df
+        .with_columns(
+            pl.col('end_period_ts').dt.convert_time_zone('America/Denver').dt.date().alias('date'),
+            pl.col('game_start_time_utc').dt.convert_time_zone('America/Denver').dt.date().alias('game_day'),
+            pl.col('result').replace({'yes': '1', 'no': '0'}).cast(pl.Int8),
+            pl.col('yes_ask_close').alias('price')
+        )
+        .filter(
+            pl.col('date').eq(pl.col('game_day')),
+            pl.col('price').is_between(price_min, price_max)
+        )
+        .with_columns(
+            pl.when(pl.col('result').eq(1))
+            .then(pl.lit(100).sub(pl.col('price')))
+            .otherwise(pl.col('price').mul(-1))
+            .truediv('price')
+            .alias('return')
+        )
+        .group_by('date', 'price')
+        .agg(
+            pl.col('return').sum().alias('return_sum'),
+            pl.len().alias('count')
+        )
+    )
+
+    if buckets.is_empty():
+        raise ValueError(f"No trades with price in [{price_min}, {price_max}]")
+
+    dates = buckets['date'].unique().sort()
+    n_prices = price_max - price_min + 1
+
+    day_index = dates.search_sorted(buckets['date']).to_numpy()
+    price_index = buckets['price'].to_numpy() - price_min
+
+    return_sums = np.zeros((len(dates), n_prices + 1))
+    counts = np.zeros((len(dates), n_prices + 1))
+    return_sums[day_index, price_index + 1] = buckets['return_sum'].to_numpy()
+    counts[day_index, price_index + 1] = buckets['count'].to_numpy()
+
+    # Prefix sums over price turn every band into one subtraction per day
+    return_sums = return_sums.cumsum(axis=1)
+    counts = counts.cumsum(axis=1)
+
+    lows, highs = np.triu_indices(n_prices)
+    band_sums = return_sums[:, highs + 1] - return_sums[:, lows]
+    band_counts = counts[:, highs + 1] - counts[:, lows]
+
+    # Days without trades in a band are skipped, like the group_by in get_strategy_returns
+    traded = band_counts > 0
+    returns = np.divide(
+        band_sums, band_counts, out=np.zeros_like(band_sums), where=traded
+    )
+
+    cumulative_return = np.cumprod(1 + returns, axis=0) - 1
+
+    # Days before a band's first trade must not count as a peak of 0
+    started = np.logical_or.accumulate(traded, axis=0)
+    peak = np.maximum.accumulate(
+        np.where(started, cumulative_return, -np.inf), axis=0
+    )
+    drawdown = np.where(started, cumulative_return - peak, 0)
+
+    days = traded.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = returns.sum(axis=0) / days
+        std = np.sqrt((((returns - mean) ** 2) * traded).sum(axis=0) / days)
+
+        max_drawdown = drawdown.min(axis=0)
+        sharpe = (mean * 16**0.5) / std
+        calmar = (mean * 16) / np.abs(max_drawdown)
+
+    return pl.DataFrame({
+        'price_min': lows + price_min,
+        'price_max': highs + price_min,
+        'days': days,
+        'trades': band_counts.sum(axis=0).astype(np.int64),
+        'cumulative_return': cumulative_return[-1],
+        'sharpe': sharpe,
+        'calmar': calmar,
+        'max_drawdown': max_drawdown,
+    }).filter(pl.col('days').gt(0))
+
+
 if __name__ == "__main__":
     # Parameters
     price_min = 90
@@ -160,7 +257,7 @@ if __name__ == "__main__":
     os.makedirs(folder, exist_ok=True)
 
     # Load data
-    df = pl.read_parquet('data/2025-11-11_history_daily.parquet')
+    df = scan_history(daily=True).collect()
 
     # Get strategy returns
     results = get_strategy_returns(df, price_min, price_max)
@@ -168,20 +265,31 @@ if __name__ == "__main__":
     print(results)
 
     # Create charts
-    create_cumulative_return_chart(
-        results,
-        title=f"Cumulative Return (Price: {price_min}-{price_max})",
-        file_name=f"{folder}/cumulative_return.png"
-    )
-
-    create_drawdown_chart(
-        results,
-        title=f"Drawdown (Price: {price_min}-{price_max})",
-        file_name=f"{folder}/drawdown.png"
-    )
+    render_charts([
+        (
+            create_cumulative_return_chart,
+            dict(
+                results=results,
+                title=f"Cumulative Return (Price: {price_min}-{price_max})",
+                file_name=f"{folder}/cumulative_return.png"
+            )
+        ),
+        (
+            create_drawdown_chart,
+            dict(
+                results=results,
+                title=f"Drawdown (Price: {price_min}-{price_max})",
+                file_name=f"{folder}/drawdown.png"
+            )
+        )
+    ])
 
     # Calculate and print performance metrics
     metrics = calculate_performance_metrics(results)
     print(f"Sharpe: {metrics['sharpe']:.4f}")
     print(f"Calmar: {metrics['calmar']:.4f}")
     print(f"Max Drawdown: {metrics['max_drawdown']:.4f}")
+
+    # Sharpe/Calmar/drawdown surface over every price band
+    surface = get_band_surface(df)
+    print(surface.sort('sharpe', descending=True, nulls_last=True).head(10))
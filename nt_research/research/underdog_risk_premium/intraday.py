@@ -0,0 +1,378 @@
+import argparse
+import itertools
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import polars as pl
+from nt_research.datasets.history import scan_history
+from nt_research.research.underdog_risk_premium.backtest import TAKER_FEE_RATE
+
+INTRADAY_SPEC_SCHEMA = {
+    "strategy_id": pl.Int64,
+    "entry_time": pl.Int64,  # elapsed minutes relative to kickoff
+    "entry_window": pl.Int64,  # minutes the entry limit order rests
+    "entry_price": pl.Int64,  # limit price in cents, filled against the ask
+    "take_profit": pl.Int64,  # sell limit in cents against the bid, null to hold
+    "stop_loss": pl.Int64,  # sell stop in cents against the bid, null to hold
+    "contracts": pl.Float64,
+    "fee_rate": pl.Float64,
+}
+
+CANDLE_COLUMNS = [
+    "yes_ask_open",
+    "yes_ask_low",
+    "yes_bid_open",
+    "yes_bid_low",
+    "yes_bid_high",
+]
+
+EXIT_REASONS = ["settlement", "take_profit", "stop_loss"]
+
+# Per-trade arrays simulate builds before resolving rows to tickers/timestamps,
+# exit_reason -1 marks an unsettled market with no exit
+TRADE_SCHEMA = {
+    "strategy_id": pl.Int64,
+    "ticker_row": pl.Int64,
+    "entry_row": pl.Int64,
+    "exit_row": pl.Int64,
+    "entry_price": pl.Float64,
+    "exit_price": pl.Float64,
+    "exit_reason": pl.Int64,
+    "contracts": pl.Float64,
+    "fee": pl.Float64,
+}
+
+
+def make_intraday_specs(
+    entry_times: list[int],
+    entry_prices: list[int],
+    take_profits: list[int | None] = (None,),
+    stop_losses: list[int | None] = (None,),
+    entry_window: int = 60,
+    contracts: float = 1.0,
+    fee_rate: float = TAKER_FEE_RATE,
+) -> pl.DataFrame:
+    # Full grid of strategy specs
+    rows = [
+        {
+            "entry_time": entry_time,
+            "entry_window": entry_window,
+            "entry_price": entry_price,
+            "take_profit": take_profit,
+            "stop_loss": stop_loss,
+            "contracts": contracts,
+            "fee_rate": fee_rate,
+        }
+        for entry_time, entry_price, take_profit, stop_loss in itertools.product(
+            entry_times, entry_prices, take_profits, stop_losses
+        )
+    ]
+
+    schema = {
+        col: dtype
+        for col, dtype in INTRADAY_SPEC_SCHEMA.items()
+        if col != "strategy_id"
+    }
+
+    return (
+        pl.DataFrame(rows, schema=schema)
+        .with_row_index("strategy_id")
+        .cast(INTRADAY_SPEC_SCHEMA)
+    )
+
+
+def get_ticker_batches(
+    history: pl.LazyFrame, batch_size: int
+) -> list[tuple[str, str]]:
+    # Contiguous ticker ranges, a filter parquet statistics can prune
+    tickers = history.select(pl.col("ticker").unique().sort()).collect()["ticker"]
+
+    return [
+        (tickers[i], tickers[min(i + batch_size, len(tickers)) - 1])
+        for i in range(0, len(tickers), batch_size)
+    ]
+
+
+def load_candles(
+    history: pl.LazyFrame, first_ticker: str, last_ticker: str
+) -> pl.DataFrame:
+    return (
+        history.filter(
+            pl.col("ticker").is_between(pl.lit(first_ticker), pl.lit(last_ticker))
+        )
+        .select(
+            "ticker",
+            "end_period_ts",
+            pl.col("end_period_ts")
+            .sub(pl.col("game_start_time_utc"))
+            .dt.total_minutes()
+            .alias("elapsed_time"),
+            pl.col(CANDLE_COLUMNS).cast(pl.Float64),
+            pl.col("result").replace({"yes": "1", "no": "0"}).cast(pl.Int8),
+        )
+        .sort("ticker", "end_period_ts")
+        .collect()
+    )
+
+
+def _get_fee(fee_rate: float, contracts: float, price: np.ndarray) -> np.ndarray:
+    # Rounding first keeps exact cent amounts from ceiling up on float error
+    price = price / 100
+    fee = fee_rate * contracts * price * (1 - price) * 100
+    return np.ceil(np.round(fee, 6)) / 100
+
+
+def _get_next_hits(hits: np.ndarray) -> np.ndarray:
+    # Per row, the first row at or after it where hits is True, len(hits) when
+    # there is none. One extra row so the candle after the last one is valid
+    n = len(hits)
+    next_hits = np.where(hits, np.arange(n), n)
+    return np.r_[np.minimum.accumulate(next_hits[::-1])[::-1], n]
+
+
+def _get_next_hit_table(
+    values: np.ndarray,
+    thresholds: pl.Series,
+    hit: Callable[[np.ndarray, float], np.ndarray],
+) -> tuple[np.ndarray, np.ndarray]:
+    # One next-hit row per distinct threshold, plus a never-hit row for nulls
+    levels = thresholds.drop_nulls().unique().sort().to_numpy()
+    n = len(values)
+
+    table = np.full((len(levels) + 1, n + 1), n)
+    for i, level in enumerate(levels):
+        table[i] = _get_next_hits(hit(values, level))
+
+    index = np.searchsorted(levels, thresholds.fill_null(np.inf).to_numpy())
+    return table, index
+
+
+def simulate(candles: pl.DataFrame, specs: pl.DataFrame) -> pl.DataFrame:
+    # candles must be sorted by ticker and end_period_ts
+    n = candles.height
+    if n == 0 or specs.is_empty():
+        return _to_trades(candles, None)
+
+    tickers = candles["ticker"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, tickers[1:] != tickers[:-1]])
+    lengths = np.diff(np.r_[starts, n])
+    ends = starts + lengths
+    ticker_index = np.repeat(np.arange(len(starts)), lengths)
+
+    elapsed = candles["elapsed_time"].to_numpy()
+    ask_open, ask_low, bid_open, bid_low, bid_high = (
+        candles[col].to_numpy() for col in CANDLE_COLUMNS
+    )
+    results = candles["result"].cast(pl.Float64).to_numpy()[starts]
+
+    # Entries depend only on the entry order, so each distinct order is filled
+    # once and shared by every spec that places it
+    specs = specs.with_row_index("spec_row")
+    spec_rows, entry_rows = [], []
+    for (entry_time, entry_window), window_specs in specs.group_by(
+        "entry_time", "entry_window", maintain_order=True
+    ):
+        window_rows = np.flatnonzero(
+            (elapsed > entry_time) & (elapsed <= entry_time + entry_window)
+        )
+
+        for (entry_price,), order_specs in window_specs.group_by(
+            "entry_price", maintain_order=True
+        ):
+            # Resting buy limit fills on the first candle whose ask trades through it
+            fill_rows = window_rows[ask_low[window_rows] <= entry_price]
+            fill_tickers = ticker_index[fill_rows]
+            fill_rows = fill_rows[np.diff(fill_tickers, prepend=-1) != 0]
+
+            order_spec_rows = order_specs["spec_row"].to_numpy()
+            spec_rows.append(np.tile(order_spec_rows, len(fill_rows)))
+            entry_rows.append(np.repeat(fill_rows, len(order_spec_rows)))
+
+    spec_rows = np.concatenate(spec_rows)
+    entry_rows = np.concatenate(entry_rows)
+    if len(entry_rows) == 0:
+        return _to_trades(candles, None)
+
+    # Same order as one spec at a time: by spec, then ticker
+    order = np.lexsort((entry_rows, spec_rows))
+    spec_rows, entry_rows = spec_rows[order], entry_rows[order]
+    trade_tickers = ticker_index[entry_rows]
+
+    spec = {
+        col: specs[col].to_numpy()[spec_rows]
+        for col in ["strategy_id", "entry_price", "contracts", "fee_rate"]
+    }
+
+    # Exits are only checked from the candle after the fill, and the first
+    # take-profit or stop hit at or after it is looked up per threshold
+    take_profit_table, take_profit_index = _get_next_hit_table(
+        bid_high, specs["take_profit"], np.greater_equal
+    )
+    stop_loss_table, stop_loss_index = _get_next_hit_table(
+        bid_low, specs["stop_loss"], np.less_equal
+    )
+    take_profit_rows = take_profit_table[take_profit_index[spec_rows], entry_rows + 1]
+    stop_loss_rows = stop_loss_table[stop_loss_index[spec_rows], entry_rows + 1]
+
+    exit_rows = np.minimum(take_profit_rows, stop_loss_rows)
+    exited = exit_rows < ends[trade_tickers]
+    exit_at = np.where(exited, exit_rows, 0)
+
+    # Gaps through the order fill at the open, otherwise at the order price
+    entry_price = np.fmin(spec["entry_price"], ask_open[entry_rows])
+
+    # Stop first when both trigger in one candle, the conservative fill
+    stopped = exited & (stop_loss_rows <= take_profit_rows)
+    take_profit = specs["take_profit"].fill_null(0).to_numpy()[spec_rows]
+    stop_loss = specs["stop_loss"].fill_null(0).to_numpy()[spec_rows]
+    exit_price = np.where(
+        stopped,
+        np.fmin(stop_loss, bid_open[exit_at]),
+        np.fmax(take_profit, bid_open[exit_at]),
+    )
+
+    # Unsettled markets have no settlement price, their exit stays null
+    exit_price = np.where(exited, exit_price, results[trade_tickers] * 100)
+    exit_reason = np.where(stopped, 2, np.where(exited, 1, 0))
+    exit_reason = np.where(np.isnan(exit_price), -1, exit_reason)
+
+    entry_fee = _get_fee(spec["fee_rate"], spec["contracts"], entry_price)
+    exit_fee = _get_fee(spec["fee_rate"], spec["contracts"], exit_price)
+    exit_fee = np.where(exited, exit_fee, 0)
+
+    return _to_trades(
+        candles,
+        {
+            "strategy_id": spec["strategy_id"],
+            "ticker_row": starts[trade_tickers],
+            "entry_row": entry_rows,
+            "exit_row": np.where(exited, exit_rows, -1),
+            "entry_price": entry_price,
+            "exit_price": exit_price,
+            "exit_reason": exit_reason,
+            "contracts": spec["contracts"],
+            "fee": entry_fee + exit_fee,
+        },
+    )
+
+
+def _to_trades(candles: pl.DataFrame, trades: dict | None) -> pl.DataFrame:
+    raw = pl.DataFrame(trades, schema=TRADE_SCHEMA).with_columns(
+        pl.when(pl.col("exit_row").ge(0)).then("exit_row").alias("exit_row"),
+        pl.col("exit_price").fill_nan(None),
+    )
+
+    timestamps = candles["end_period_ts"]
+
+    return (
+        raw.select(
+            "strategy_id",
+            candles["ticker"].gather(raw["ticker_row"]).alias("ticker"),
+            timestamps.gather(raw["entry_row"]).alias("entry_ts"),
+            "entry_price",
+            timestamps.gather(raw["exit_row"]).alias("exit_ts"),
+            "exit_price",
+            pl.col("exit_reason").replace_strict(
+                dict(enumerate(EXIT_REASONS)), default=None, return_dtype=pl.String
+            ),
+            "contracts",
+            "fee",
+        )
+        .with_columns(
+            pl.col("contracts")
+            .mul(pl.col("exit_price").sub("entry_price"))
+            .truediv(100)
+            .sub("fee")
+            .alias("profit"),
+            pl.col("contracts")
+            .mul("entry_price")
+            .truediv(100)
+            .add(pl.col("fee"))
+            .alias("cost"),
+        )
+        .with_columns(pl.col("profit").truediv("cost").alias("return"))
+    )
+
+
+def _simulate_batch(
+    source: str | None, first_ticker: str, last_ticker: str, specs: pl.DataFrame
+) -> tuple[pl.DataFrame, int]:
+    candles = load_candles(scan_history(source=source), first_ticker, last_ticker)
+    return simulate(candles, specs), candles.height
+
+
+def run_intraday_backtest(
+    specs: pl.DataFrame,
+    source: str | None = None,
+    batch_size: int = 500,
+    max_workers: int = 1,
+) -> tuple[pl.DataFrame, int]:
+    # Tickers stream through in sorted batches so memory is bounded by one batch
+    batches = get_ticker_batches(scan_history(source=source), batch_size)
+
+    if max_workers == 1:
+        results = [
+            _simulate_batch(source, first_ticker, last_ticker, specs)
+            for first_ticker, last_ticker in batches
+        ]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _simulate_batch, source, first_ticker, last_ticker, specs
+                )
+                for first_ticker, last_ticker in batches
+            ]
+            results = [future.result() for future in futures]
+
+    trades = pl.concat([trades for trades, _ in results]).sort(
+        "strategy_id", "ticker", "entry_ts"
+    )
+
+    return trades, sum(n_candles for _, n_candles in results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--source", default=None)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--max-workers", type=int, default=1)
+    args = parser.parse_args()
+
+    specs = make_intraday_specs(
+        entry_times=[-180, -120, -60, 0],
+        entry_prices=[80, 85, 90, 95],
+        take_profits=[None, 99],
+        stop_losses=[None, 50, 70],
+    )
+
+    t0 = time.perf_counter()
+    trades, n_candles = run_intraday_backtest(
+        specs,
+        source=args.source,
+        batch_size=args.batch_size,
+        max_workers=args.max_workers,
+    )
+    elapsed = time.perf_counter() - t0
+
+    print(
+        f"{n_candles:,} candles x {specs.height} strategies in {elapsed:.1f}s "
+        f"({n_candles / elapsed / 1e6:.2f}M candles/s)"
+    )
+
+    print(
+        trades.group_by("strategy_id")
+        .agg(
+            pl.len().alias("trades"),
+            pl.col("profit").sum(),
+            pl.col("return").mean(),
+            pl.col("exit_reason").value_counts(),
+        )
+        .join(specs, on="strategy_id")
+        .sort("profit", descending=True)
+    )
@@ -0,0 +1,243 @@
+import argparse
+import os
+import time
+import polars as pl
+import nt_research.research.underdog_risk_premium.data_utils as du
+import nt_research.research.underdog_risk_premium.experiment_1 as experiment_1
+import nt_research.research.underdog_risk_premium.experiment_2 as experiment_2
+import nt_research.research.underdog_risk_premium.experiment_3 as experiment_3
+import nt_research.research.underdog_risk_premium.experiment_4 as experiment_4
+from nt_research.dag import DAG, Node
+from nt_research.datasets.history import resolve_history_path, scan_history
+from nt_research.rendering import save_tables
+
+RESULTS_DIR = "nt_research/research/underdog_risk_premium/results"
+
+# Same parameters as the experiment scripts
+MIN_ELAPSED_TIME = -180
+MAX_ELAPSED_TIME = 180
+TIME_INTERVAL = 60
+TRADE_TIME = -60
+TIME_BIN = f"({TRADE_TIME}, {TRADE_TIME + TIME_INTERVAL}]"
+TOP_PRICE_BIN = "(90, 99]"
+PRICE_MIN = 90
+PRICE_MAX = 99
+
+
+def filter_bins(
+    trades: pl.DataFrame, time_bin: str | None = None, price_bin: str | None = None
+) -> pl.DataFrame:
+    if time_bin is not None:
+        trades = trades.filter(pl.col("time_bin").eq(time_bin))
+
+    if price_bin is not None:
+        trades = trades.filter(pl.col("price_bin").eq(price_bin))
+
+    return trades
+
+
+def load_history(source: str) -> pl.DataFrame:
+    return scan_history(source=source).collect()
+
+
+def get_performance_metrics(returns: pl.DataFrame) -> pl.DataFrame:
+    return pl.DataFrame([experiment_4.calculate_performance_metrics(returns)])
+
+
+def save_result_tables(
+    results: pl.DataFrame,
+    profits: pl.DataFrame,
+    calibration_file_name: str,
+    performance_file_name: str,
+    title: str | None = None,
+) -> None:
+    # Both tables in one call so they share a single browser session
+    save_tables(
+        [
+            (
+                experiment_1.get_calibration_table(results, title),
+                calibration_file_name,
+            ),
+            (
+                experiment_3.get_performance_table(
+                    experiment_3.get_performance(profits)
+                ),
+                performance_file_name,
+            ),
+        ]
+    )
+
+
+def get_nodes(
+    source: str | None = None,
+    daily_source: str | None = None,
+    results_dir: str = RESULTS_DIR,
+) -> list[Node]:
+    source = source if source is not None else resolve_history_path()
+    daily_source = (
+        daily_source if daily_source is not None else resolve_history_path(daily=True)
+    )
+
+    e1, e2, e3, e4 = [
+        os.path.join(results_dir, f"experiment_{i}") for i in range(1, 5)
+    ]
+    calibration_table = f"{e1}/calibration_table_t={TRADE_TIME}.png"
+    performance_table = f"{e3}/performance_table_t={TRADE_TIME}.png"
+
+    # Charts write a single file named by their file_name param
+    def artifact(name: str, function, deps: tuple[str, ...], file_name: str, **params):
+        return Node(
+            name,
+            function,
+            deps=deps,
+            params={**params, "file_name": file_name},
+            outputs=(file_name,),
+        )
+
+    return [
+        # Trades: one first-entry cube shared by experiments 1-3
+        Node(
+            "trades",
+            du.get_trades,
+            params=dict(
+                min_elapsed_time=MIN_ELAPSED_TIME,
+                max_elapsed_time=MAX_ELAPSED_TIME,
+                time_interval=TIME_INTERVAL,
+                source=source,
+                use_cache=False,
+            ),
+            inputs=(du.get_source_fingerprint(source),),
+        ),
+        # Experiment 1
+        Node(
+            "trades_1",
+            filter_bins,
+            deps=("trades",),
+            params=dict(time_bin=TIME_BIN),
+        ),
+        Node("results_1", experiment_1.get_results, deps=("trades_1",)),
+        artifact(
+            "chart_1",
+            experiment_1.create_calibration_chart,
+            ("results_1",),
+            f"{e1}/calibration_chart_t={TRADE_TIME}.png",
+            title=f"Contract Calibration (t={TRADE_TIME})",
+        ),
+        # Experiment 2
+        Node("results_2", experiment_2.get_results, deps=("trades",)),
+        artifact(
+            "calibration_over_time_2",
+            experiment_2.create_calibration_over_time_chart,
+            ("results_2",),
+            f"{e2}/calibration-over-time-across-bins.png",
+            title="Calibration Over Time Across Price Bins",
+        ),
+        artifact(
+            "calibration_over_time_top_bin_2",
+            experiment_2.create_calibration_over_time_chart,
+            ("results_2",),
+            f"{e2}/calibration-over-time-top-bin.png",
+            price_bin=TOP_PRICE_BIN,
+            title=f"{TOP_PRICE_BIN} Bin Calibration Over Time",
+        ),
+        artifact(
+            "count_over_time_top_bin_2",
+            experiment_2.create_count_over_time_chart,
+            ("results_2",),
+            f"{e2}/count-over-time-top-bin.png",
+            price_bin=TOP_PRICE_BIN,
+            title=f"{TOP_PRICE_BIN} Bin Count Over Time",
+        ),
+        artifact(
+            "tstat_over_time_2",
+            experiment_2.create_tstat_chart,
+            ("results_2",),
+            f"{e2}/tstat-over-time.png",
+            title="T-stat Count Over Time Across Price Bins",
+        ),
+        artifact(
+            "tstat_over_time_top_bin_2",
+            experiment_2.create_tstat_chart,
+            ("results_2",),
+            f"{e2}/tstat-over-time-top-bin.png",
+            price_bin=TOP_PRICE_BIN,
+            title=f"{TOP_PRICE_BIN} T-stat Count Over Time",
+        ),
+        artifact(
+            "counts_heatmap_2",
+            experiment_2.create_count_heatmap,
+            ("trades",),
+            f"{e2}/counts-heatmap.png",
+        ),
+        # Experiment 3
+        Node(
+            "trades_3",
+            filter_bins,
+            deps=("trades",),
+            params=dict(time_bin=TIME_BIN, price_bin=TOP_PRICE_BIN),
+        ),
+        Node("profits_3", experiment_3.get_profits, deps=("trades_3",)),
+        Node("lost_trades_3", experiment_3.get_lost_trades, deps=("trades_3",)),
+        # Tables from experiments 1 and 3
+        Node(
+            "tables",
+            save_result_tables,
+            deps=("results_1", "profits_3"),
+            params=dict(
+                calibration_file_name=calibration_table,
+                performance_file_name=performance_table,
+                title=f"Contract Calibration (t={TRADE_TIME})",
+            ),
+            outputs=(calibration_table, performance_table),
+        ),
+        # Experiment 4
+        Node(
+            "history_daily",
+            load_history,
+            params=dict(source=daily_source),
+            inputs=(du.get_source_fingerprint(daily_source),),
+        ),
+        Node(
+            "returns_4",
+            experiment_4.get_strategy_returns,
+            deps=("history_daily",),
+            params=dict(price_min=PRICE_MIN, price_max=PRICE_MAX),
+        ),
+        Node("metrics_4", get_performance_metrics, deps=("returns_4",)),
+        Node("band_surface_4", experiment_4.get_band_surface, deps=("history_daily",)),
+        artifact(
+            "cumulative_return_4",
+            experiment_4.create_cumulative_return_chart,
+            ("returns_4",),
+            f"{e4}/cumulative_return.png",
+            title=f"Cumulative Return (Price: {PRICE_MIN}-{PRICE_MAX})",
+        ),
+        artifact(
+            "drawdown_4",
+            experiment_4.create_drawdown_chart,
+            ("returns_4",),
+            f"{e4}/drawdown.png",
+            title=f"Drawdown (Price: {PRICE_MIN}-{PRICE_MAX})",
+        ),
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+
+    dag = DAG(get_nodes())
+
+    t0 = time.perf_counter()
+    completed = dag.run(max_workers=args.max_workers, force=args.force)
+    elapsed = time.perf_counter() - t0
+
+    print(f"Ran {len(completed)} of {len(dag.nodes)} nodes in {elapsed:.1f}s")
+    print(completed)
+
+    print(dag.read("metrics_4"))
+
+    surface = dag.read("band_surface_4")
+    print(surface.sort("sharpe", descending=True, nulls_last=True).head(10))
@@ -0,0 +1,166 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import polars as pl
+from nt_research.research.underdog_risk_premium.data_utils import get_trades
+
+# Kalshi tickers look like KXNCAAFGAME-25NOV08ALAOKLA-ALA
+EVENT_TICKER_PATTERN = r"^(.*)-[^-]+$"
+GAME_DAY_PATTERN = r"^[^-]+-(\d{2}[A-Z]{3}\d{2})"
+
+
+def get_clusters(trades: pl.DataFrame, cluster: str) -> pl.Series:
+    match cluster:
+        case "event":
+            clusters = trades["ticker"].str.extract(EVENT_TICKER_PATTERN, 1)
+        case "day":
+            clusters = trades["ticker"].str.extract(GAME_DAY_PATTERN, 1)
+        case _:
+            raise ValueError(f"Unsupported cluster: {cluster}")
+
+    unmatched = trades["ticker"].filter(clusters.is_null()).unique()
+    if not unmatched.is_empty():
+        raise ValueError(
+            f"{unmatched.len()} tickers have no {cluster} cluster, "
+            f"e.g. {unmatched.head(3).to_list()}"
+        )
+
+    return clusters
+
+
+def _bootstrap_batch(
+    seed: np.random.SeedSequence,
+    n_resamples: int,
+    result_sums: np.ndarray,
+    price_sums: np.ndarray,
+    counts: np.ndarray,
+) -> np.ndarray:
+    # Cluster index matrix -> cluster weight matrix -> bin sums via matmul
+    rng = np.random.default_rng(seed)
+    n_clusters = counts.shape[0]
+
+    index = rng.integers(0, n_clusters, size=(n_resamples, n_clusters))
+    offsets = np.arange(n_resamples)[:, None] * n_clusters
+    weights = np.bincount(
+        (index + offsets).ravel(), minlength=n_resamples * n_clusters
+    ).reshape(n_resamples, n_clusters)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bin_counts = weights @ counts
+        return (weights @ result_sums * 100 - weights @ price_sums) / bin_counts
+
+
+def _sign_flip_batch(
+    seed: np.random.SeedSequence,
+    n_resamples: int,
+    residual_sums: np.ndarray,
+) -> np.ndarray:
+    # Flip the sign of whole clusters, which keeps within-cluster correlation
+    rng = np.random.default_rng(seed)
+    signs = rng.choice([-1.0, 1.0], size=(n_resamples, residual_sums.shape[0]))
+    return signs @ residual_sums
+
+
+def get_resampled_results(
+    trades: pl.DataFrame,
+    by: tuple[str, ...] = ("price_bin", "time_bin"),
+    cluster: str = "event",
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int = 0,
+    batch_size: int = 1_000,
+    max_workers: int | None = None,
+) -> pl.DataFrame:
+    by = list(by)
+
+    trades = trades.with_columns(get_clusters(trades, cluster).alias("cluster"))
+
+    # Per cluster x bin sums are all any resample needs
+    sums = (
+        trades.group_by("cluster", *by)
+        .agg(
+            pl.col("result").sum().alias("result_sum"),
+            pl.col("yes_ask_close").sum().alias("price_sum"),
+            pl.len().alias("count"),
+        )
+        .with_columns(
+            pl.col("cluster").rank("dense").sub(1).alias("cluster_index"),
+            pl.struct(by).rank("dense").sub(1).alias("bin_index"),
+        )
+    )
+
+    bins = sums.group_by("bin_index").agg(pl.col(by).first()).sort("bin_index")
+    n_clusters = sums["cluster_index"].max() + 1
+    n_bins = bins.height
+
+    def to_matrix(col: str) -> np.ndarray:
+        matrix = np.zeros((n_clusters, n_bins))
+        matrix[sums["cluster_index"].to_numpy(), sums["bin_index"].to_numpy()] = sums[
+            col
+        ].to_numpy()
+        return matrix
+
+    result_sums = to_matrix("result_sum")
+    price_sums = to_matrix("price_sum")
+    counts = to_matrix("count")
+    residual_sums = result_sums * 100 - price_sums
+
+    total_counts = counts.sum(axis=0)
+    delta = residual_sums.sum(axis=0) / total_counts
+
+    # Independent streams per batch so results do not depend on worker count
+    batch_sizes = [
+        min(batch_size, n_resamples - start) for start in range(0, n_resamples, batch_size)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(2 * len(batch_sizes))
+
+    # polars is not fork-safe, hence spawn
+    with ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        bootstrap_futures = [
+            executor.submit(
+                _bootstrap_batch, seeds[i], size, result_sums, price_sums, counts
+            )
+            for i, size in enumerate(batch_sizes)
+        ]
+        sign_flip_futures = [
+            executor.submit(
+                _sign_flip_batch, seeds[len(batch_sizes) + i], size, residual_sums
+            )
+            for i, size in enumerate(batch_sizes)
+        ]
+
+        bootstrap = np.vstack([future.result() for future in bootstrap_futures])
+        sign_flips = np.vstack([future.result() for future in sign_flip_futures])
+
+    alpha = (1 - confidence) / 2
+    ci_low, ci_high = np.nanquantile(bootstrap, [alpha, 1 - alpha], axis=0)
+
+    observed = np.abs(residual_sums.sum(axis=0))
+    exceed = (np.abs(sign_flips) >= observed - 1e-9).sum(axis=0)
+    p_value = (exceed + 1) / (n_resamples + 1)
+
+    return (
+        bins.drop("bin_index")
+        .with_columns(
+            pl.Series("count", total_counts.astype(np.int64)),
+            pl.Series("clusters", (counts > 0).sum(axis=0)),
+            pl.Series("delta", delta),
+            pl.Series("delta_se", np.nanstd(bootstrap, axis=0, ddof=1)),
+            pl.Series("delta_ci_low", ci_low),
+            pl.Series("delta_ci_high", ci_high),
+            pl.Series("p_value", p_value),
+        )
+        .sort(by)
+    )
+
+
+if __name__ == "__main__":
+    trades = get_trades(min_elapsed_time=-180, max_elapsed_time=180, time_interval=60)
+
+    pl.Config.set_tbl_rows(-1)
+    print(get_resampled_results(trades, cluster="event"))
+    print(get_resampled_results(trades, cluster="day"))
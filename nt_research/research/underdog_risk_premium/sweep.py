@@ -0,0 +1,133 @@
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import polars as pl
+import nt_research.research.underdog_risk_premium.data_utils as du
+from nt_research.datasets.history import resolve_history_path, scan_history
+
+RESULTS_SCHEMA = {
+    "time_interval": pl.Int32,
+    "price_breaks": pl.String,
+    "trade_time": pl.Int64,
+    "time_bin": pl.String,
+    "price_bin": pl.String,
+    "trade_time_mean": pl.Float64,
+    "price_mean": pl.Float64,
+    "result_mean": pl.Float64,
+    "result_stdev": pl.Float64,
+    "count": pl.UInt32,
+    "delta": pl.Float64,
+    "tstat": pl.Float64,
+}
+
+
+def get_calibration_results(trades: pl.LazyFrame) -> pl.LazyFrame:
+    # Same statistics as experiment_1/experiment_2 get_results, per price and time bin
+    return (
+        trades.group_by("price_bin", "time_bin")
+        .agg(
+            pl.col("elapsed_time").mean().alias("trade_time_mean"),
+            pl.col("yes_ask_close").mean().alias("price_mean"),
+            pl.col("result").mean().mul(100).alias("result_mean"),
+            pl.col("result").std().mul(100).alias("result_stdev"),
+            pl.len().alias("count"),
+        )
+        .with_columns(pl.col("result_mean").sub("price_mean").alias("delta"))
+        .with_columns(
+            (
+                pl.col("delta") / (pl.col("result_stdev") / pl.col("count").sqrt())
+            ).alias("tstat")
+        )
+    )
+
+
+def _run_configs(
+    source: str,
+    min_elapsed_time: int,
+    max_elapsed_time: int,
+    configs: list[tuple[int, tuple[int, ...]]],
+) -> pl.DataFrame:
+    # All configs hang off one scan so collect_all reads the history once
+    lf = scan_history(source=source).select(
+        "end_period_ts", "ticker", "yes_ask_close", "game_start_time_utc", "result"
+    )
+
+    results = [
+        get_calibration_results(
+            du.get_trades_lazy(
+                lf,
+                min_elapsed_time,
+                max_elapsed_time,
+                time_interval,
+                price_breaks=list(price_breaks),
+            )
+        ).with_columns(
+            pl.lit(time_interval).alias("time_interval"),
+            pl.lit(str(list(price_breaks))).alias("price_breaks"),
+        )
+        for time_interval, price_breaks in configs
+    ]
+
+    return pl.concat(pl.collect_all(results))
+
+
+def run_sweep(
+    time_intervals: list[int],
+    price_break_sets: list[list[int]],
+    trade_times: list[int] | None = None,
+    min_elapsed_time: int = -180,
+    max_elapsed_time: int = 180,
+    source: str | None = None,
+    max_workers: int | None = None,
+) -> pl.DataFrame:
+    price_break_sets = [tuple(breaks) for breaks in price_break_sets]
+    configs = list(itertools.product(time_intervals, price_break_sets))
+
+    if not configs:
+        return pl.DataFrame(schema=RESULTS_SCHEMA)
+
+    source = source if source is not None else resolve_history_path()
+
+    # One chunk of configs per worker, each worker scans the history once
+    max_workers = min(max_workers or os.cpu_count() or 1, len(configs))
+    chunks = [configs[i::max_workers] for i in range(max_workers)]
+
+    # Polars is not fork-safe
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        results = list(
+            executor.map(
+                _run_configs,
+                itertools.repeat(source),
+                itertools.repeat(min_elapsed_time),
+                itertools.repeat(max_elapsed_time),
+                chunks,
+            )
+        )
+
+    results = pl.concat(results).with_columns(
+        pl.col("time_bin")
+        .str.extract(r"\((-?\d+)", 1)
+        .cast(pl.Int64)
+        .alias("trade_time")
+    )
+
+    if trade_times is not None:
+        results = results.filter(pl.col("trade_time").is_in(trade_times))
+
+    return results.select(list(RESULTS_SCHEMA)).sort("time_interval", "price_breaks", "trade_time", "price_mean")
+
+
+if __name__ == "__main__":
+    results = run_sweep(
+        time_intervals=[15, 30, 60],
+        price_break_sets=[
+            [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 99],
+            [0, 20, 40, 60, 80, 99],
+            [0, 5, 10, 90, 95, 99],
+        ],
+    )
+
+    print(results)
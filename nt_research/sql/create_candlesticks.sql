@@ -0,0 +1,23 @@
+-- Range partitioned by candle time. The primary key is the composite
+-- (ticker, end_period_ts) index, and includes the partition key as required.
+CREATE TABLE IF NOT EXISTS {{ table_name }} (
+    ticker text NOT NULL,
+    series_ticker text NOT NULL,
+    end_period_ts timestamptz NOT NULL,
+    yes_bid_open integer,
+    yes_bid_low integer,
+    yes_bid_high integer,
+    yes_bid_close integer,
+    yes_ask_open integer,
+    yes_ask_low integer,
+    yes_ask_high integer,
+    yes_ask_close integer,
+    volume bigint,
+    open_interest bigint,
+    PRIMARY KEY (ticker, end_period_ts)
+) PARTITION BY RANGE (end_period_ts);
+
+-- Candles arrive roughly in time order, so a BRIN index is tiny and lets
+-- time windows skip blocks inside a partition
+CREATE INDEX IF NOT EXISTS {{ table_name }}_end_period_ts_brin
+    ON {{ table_name }} USING brin (end_period_ts);
@@ -0,0 +1,5 @@
+{% for partition in partitions %}
+CREATE TABLE IF NOT EXISTS {{ table_name }}_{{ partition.name }}
+    PARTITION OF {{ table_name }}
+    FOR VALUES FROM ('{{ partition.start }}') TO ('{{ partition.end }}');
+{% endfor %}
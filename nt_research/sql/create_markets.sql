@@ -0,0 +1,9 @@
+CREATE TABLE IF NOT EXISTS markets (
+    ticker text PRIMARY KEY,
+    series_ticker text NOT NULL,
+    game_start_time_utc timestamptz NOT NULL,
+    result text
+);
+
+CREATE INDEX IF NOT EXISTS markets_game_start_time_utc_idx
+    ON markets (game_start_time_utc);
@@ -0,0 +1,57 @@
+import json
+import os
+import polars as pl
+
+
+def write_parquet_atomic(df: pl.DataFrame, path: str) -> None:
+    # Write to a temp file first so a crash never leaves a half-written file
+    tmp_path = f"{path}.tmp"
+    df.write_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def read_json(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_json_atomic(obj, path: str) -> None:
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, "w") as f:
+        json.dump(obj, f, indent=2, sort_keys=True)
+
+    os.replace(tmp_path, path)
+
+
+class PartStore:
+    # Parquet parts under root/parts, only visible once manifest.parquet
+    # references them, so the manifest write is the commit point
+    def __init__(self, root: str, manifest_schema: dict) -> None:
+        self.root = root
+        self.manifest_schema = manifest_schema
+        self.parts_dir = os.path.join(root, "parts")
+        self.manifest_path = os.path.join(root, "manifest.parquet")
+        os.makedirs(self.parts_dir, exist_ok=True)
+
+    def _part_path(self, kind: str, part: str) -> str:
+        return os.path.join(self.parts_dir, f"{kind}-{part}.parquet")
+
+    def get_manifest(self) -> pl.DataFrame:
+        if not os.path.exists(self.manifest_path):
+            return pl.DataFrame(schema=self.manifest_schema)
+
+        return pl.read_parquet(self.manifest_path)
+
+    def remove_orphan_parts(self) -> None:
+        # Parts left behind by a crash before the manifest write, or replaced
+        parts = set(self.get_manifest()["part"].unique().to_list())
+
+        for file_name in os.listdir(self.parts_dir):
+            part = file_name.split("-", 1)[-1].split(".", 1)[0]
+            if part not in parts:
+                os.remove(os.path.join(self.parts_dir, file_name))
@@ -0,0 +1,41 @@
+import os
+import uuid
+from urllib.parse import quote
+import psycopg2
+import pytest
+import nt_research.database as database
+
+
+@pytest.fixture
+def database_url(monkeypatch):
+    # Disposable database over TCP (connectorx rejects socket URIs), e.g.
+    # postgresql://postgres@localhost:5432/test
+    url = os.getenv("TEST_DATABASE_URL")
+    if url is None:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    database.close_pool()
+    monkeypatch.setattr(database, "get_connection_string", lambda: url)
+    yield url
+    database.close_pool()
+
+
+@pytest.fixture
+def database_schema(database_url, monkeypatch):
+    # Fixed table names land in a throwaway schema through the search_path,
+    # and timestamps render in UTC whatever the server's zone
+    schema = f"test_{uuid.uuid4().hex[:8]}"
+    with psycopg2.connect(database_url) as conn, conn.cursor() as cursor:
+        cursor.execute(f"CREATE SCHEMA {schema}")
+    conn.close()
+
+    options = quote(f"-csearch_path={schema} -ctimezone=UTC")
+    separator = "&" if "?" in database_url else "?"
+    url = f"{database_url}{separator}options={options}"
+    monkeypatch.setattr(database, "get_connection_string", lambda: url)
+    yield schema
+
+    database.close_pool()
+    with psycopg2.connect(database_url) as conn, conn.cursor() as cursor:
+        cursor.execute(f"DROP SCHEMA {schema} CASCADE")
+    conn.close()
@@ -0,0 +1,113 @@
+import sqlite3
+import nt_research.cache as cache
+from nt_research.cache import SCHEMA_VERSION, ResponseCache, make_cache_key
+
+
+def test_cache_key_ignores_order_and_none():
+    assert make_cache_key("/markets", {"b": 2, "a": 1, "c": None}) == (
+        make_cache_key("/markets", {"a": 1, "b": 2})
+    )
+    assert make_cache_key("/markets", {"tickers": ["B", "A"]}) == (
+        make_cache_key("/markets", {"tickers": ("A", "B")})
+    )
+    assert make_cache_key("/markets", {"a": 1}) != make_cache_key("/events", {"a": 1})
+
+
+def test_get_and_set(tmp_path):
+    rc = ResponseCache(str(tmp_path / "cache.db"))
+
+    assert rc.get("a") is None
+    rc.set("a", b"one")
+    rc.set("a", b"two")
+
+    assert rc.get("a") == b"two"
+    assert rc.get_stats() == {
+        "hits": 1,
+        "misses": 1,
+        "hit_rate": 0.5,
+        "evictions": 0,
+        "entries": 1,
+        "size_bytes": 3,
+    }
+
+
+def test_expired_entries_miss(tmp_path, monkeypatch):
+    now = 1_000.0
+    monkeypatch.setattr(cache.time, "time", lambda: now)
+    rc = ResponseCache(str(tmp_path / "cache.db"))
+
+    rc.set("a", b"body", ttl=10)
+    rc.set("b", b"body")
+    now += 10
+
+    assert rc.get("a") is None
+    assert rc.get("b") == b"body"
+
+
+def test_evicts_least_recently_used(tmp_path, monkeypatch):
+    now = 1_000.0
+    monkeypatch.setattr(cache.time, "time", lambda: now)
+    rc = ResponseCache(str(tmp_path / "cache.db"), max_size_bytes=10)
+
+    for key in ["a", "b", "c"]:
+        rc.set(key, b"xxxx")
+        now += 1
+
+    # "b" becomes the oldest once "a" is read
+    assert rc.get_stats()["evictions"] == 1
+    assert rc.get("a") is None
+    now += 1
+    assert rc.get("c") == b"xxxx"
+    now += 1
+    rc.set("d", b"xxxx")
+
+    assert rc.get("c") == b"xxxx"
+    assert rc.get("b") is None
+    assert rc.get_stats()["size_bytes"] <= 10
+
+
+def test_size_survives_reopen(tmp_path):
+    path = str(tmp_path / "cache.db")
+    rc = ResponseCache(path)
+    rc.set("a", b"abc")
+    rc.set("b", b"de")
+    rc.conn.close()
+
+    rc = ResponseCache(path)
+    assert rc.total_size == 5
+    assert rc.get("a") == b"abc"
+
+
+def test_clear(tmp_path):
+    rc = ResponseCache(str(tmp_path / "cache.db"))
+    rc.set("a", b"abc")
+    rc.clear()
+
+    assert rc.get("a") is None
+    assert rc.get_stats()["entries"] == 0
+    assert rc.total_size == 0
+
+
+def test_legacy_table_dropped_once(tmp_path):
+    path = str(tmp_path / "cache.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE responses (key TEXT PRIMARY KEY)")
+    conn.commit()
+    conn.close()
+
+    rc = ResponseCache(path)
+    assert rc.conn.execute("PRAGMA user_version").fetchone() == (SCHEMA_VERSION,)
+    assert rc.conn.execute(
+        "SELECT name FROM sqlite_master WHERE name = 'responses'"
+    ).fetchone() is None
+
+    # Opening an up to date cache leaves other tables alone
+    rc.conn.execute("CREATE TABLE responses (key TEXT PRIMARY KEY)")
+    rc.set("a", b"abc")
+    rc.conn.close()
+
+    rc = ResponseCache(path)
+    assert rc.conn.execute(
+        "SELECT name FROM sqlite_master WHERE name = 'responses'"
+    ).fetchone() == ("responses",)
+    assert rc.get("a") == b"abc"
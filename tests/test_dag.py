@@ -0,0 +1,55 @@
+import os
+import polars as pl
+import nt_research.research.underdog_risk_premium.experiment_1 as experiment_1
+from nt_research.code_version import REPO_ROOT, get_function_id, get_source_files
+from nt_research.dag import DAG, Node
+
+
+def make_frame(n: int) -> pl.DataFrame:
+    return pl.DataFrame({"x": range(n)})
+
+
+def double(df: pl.DataFrame) -> pl.DataFrame:
+    return df.with_columns(pl.col("x").mul(2))
+
+
+def get_dag(cache_dir: str, n: int = 3) -> DAG:
+    return DAG(
+        [
+            Node("double", double, deps=("frame",)),
+            Node("frame", make_frame, params={"n": n}),
+        ],
+        cache_dir=cache_dir,
+    )
+
+
+def test_keys_are_stable(tmp_path):
+    assert get_dag(str(tmp_path)).keys == get_dag(str(tmp_path)).keys
+
+
+def test_param_change_invalidates_dependents(tmp_path):
+    keys = get_dag(str(tmp_path), n=3).keys
+    changed = get_dag(str(tmp_path), n=4).keys
+
+    assert keys["frame"] != changed["frame"]
+    assert keys["double"] != changed["double"]
+
+
+def test_function_id_does_not_depend_on_module_name():
+    assert get_function_id(double) == "tests/test_dag.py:double"
+
+
+def test_code_version_covers_imported_helpers():
+    path = os.path.join(REPO_ROOT, experiment_1.__file__)
+    files = {os.path.relpath(f, REPO_ROOT) for f in get_source_files(path)}
+
+    assert "nt_research/research/underdog_risk_premium/data_utils.py" in files
+    assert "nt_research/datasets/history.py" in files
+
+
+def test_run_skips_cached_nodes(tmp_path):
+    dag = get_dag(str(tmp_path))
+
+    assert sorted(dag.run(max_workers=1)) == ["double", "frame"]
+    assert dag.run(max_workers=1) == []
+    assert dag.read("double")["x"].to_list() == [0, 2, 4]
@@ -0,0 +1,155 @@
+import datetime as dt
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import polars as pl
+import psycopg2
+import pytest
+import nt_research.database as database
+
+
+@pytest.fixture
+def table_name(database_url):
+    name = f"test_{uuid.uuid4().hex[:8]}"
+    yield name
+    database.execute_query(f"DROP TABLE IF EXISTS {name}")
+
+
+@pytest.fixture
+def markets(table_name):
+    df = pl.DataFrame(
+        {
+            "id": range(100),
+            "ticker": [f"T{i:03d}" for i in range(100)],
+            "note": ["it's", None] * 50,
+        }
+    )
+    database.create_table(df, table_name, primary_key=["id"])
+    database.copy_dataframe(df, table_name)
+    return df
+
+
+def test_close_pool_without_pool(monkeypatch):
+    database.close_pool()
+
+    def fail():
+        raise AssertionError("close_pool opened a pool")
+
+    monkeypatch.setattr(database, "get_connection_string", fail)
+    database.close_pool()
+
+
+def test_checkout_waits_for_free_connection(database_url, monkeypatch):
+    monkeypatch.setattr(database, "POOL_MAX_CONNECTIONS", 2)
+
+    # More concurrent queries than connections, none may hit PoolError
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda _: database.execute_query("SELECT pg_sleep(0.05) AS slept"),
+                range(16),
+            )
+        )
+
+    assert len(results) == 16
+    assert len(database.get_pool()._used) == 0
+
+
+def test_build_select_renders_on_callers_connection(database_url):
+    with psycopg2.connect(database_url) as conn:
+        query = database.build_select(
+            conn,
+            "public.markets",
+            columns=["ticker", "select"],
+            where="note = %s",
+            params=("it's",),
+            order_by=["ticker"],
+            descending=True,
+        )
+    conn.close()
+
+    assert query == (
+        'SELECT "ticker", "select" FROM "public"."markets" '
+        "WHERE note = 'it''s' ORDER BY \"ticker\" DESC"
+    )
+    assert os.getpid() not in database._pools
+
+
+@pytest.mark.parametrize("partition_num", [1, 4])
+def test_read_dataframe(markets, table_name, partition_num):
+    database.close_pool()
+
+    df = database.read_dataframe(
+        table_name,
+        columns=["ticker", "note"],
+        where="id >= %s AND note = %s",
+        params=(10, "it's"),
+        order_by=["ticker"],
+        descending=True,
+        partition_on="id",
+        partition_num=partition_num,
+    )
+
+    expected = (
+        markets.filter(pl.col("id").ge(10), pl.col("note").eq("it's"))
+        .sort("ticker", descending=True)
+        .select("ticker", "note")
+    )
+    assert df.equals(expected)
+
+    # Rendering the query takes no pooled connection
+    assert os.getpid() not in database._pools
+
+
+def test_copy_round_trip(table_name):
+    df = pl.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "text": ['a, "b"', "", None],
+            "multiline": ["x\ny", "z", None],
+            "flag": [True, False, None],
+            "price": [0.5, None, 1e-9],
+            "ts": [dt.datetime(2025, 9, 6, 12, tzinfo=dt.timezone.utc), None, None],
+            "day": [dt.date(2025, 9, 6), None, None],
+        },
+        schema_overrides={"ts": pl.Datetime("us", "UTC")},
+    )
+    database.create_table(df, table_name, primary_key=["id"])
+
+    assert database.copy_dataframe(df, table_name, chunk_size=2) == 3
+    assert database.read_dataframe(table_name, order_by=["id"]).equals(df)
+
+
+def test_copy_upsert(table_name):
+    df = pl.DataFrame({"id": [1, 2, 3], "price": [10, 20, 30]})
+    database.create_table(df, table_name, primary_key=["id"])
+    database.copy_dataframe(df, table_name)
+
+    # Keys 2 and 3 update, 4 is new, the last duplicate of a key wins
+    update = pl.DataFrame({"id": [2, 3, 4, 2], "price": [21, 31, 41, 22]})
+    assert database.copy_dataframe(update, table_name, mode="upsert", chunk_size=1) == 3
+
+    assert database.execute_query(f"SELECT * FROM {table_name} ORDER BY id") == [
+        {"id": 1, "price": 10},
+        {"id": 2, "price": 22},
+        {"id": 3, "price": 31},
+        {"id": 4, "price": 41},
+    ]
+
+    # Only key columns, conflicts are left alone
+    keys = pl.DataFrame({"id": [1, 5]})
+    assert database.copy_dataframe(keys, table_name, mode="upsert") == 1
+    assert database.execute_query(f"SELECT count(*) AS n FROM {table_name}") == [
+        {"n": 5}
+    ]
+
+
+def test_copy_upsert_needs_primary_key(table_name):
+    df = pl.DataFrame({"id": [1]})
+    database.create_table(df, table_name)
+
+    with pytest.raises(ValueError, match="No primary key"):
+        database.copy_dataframe(df, table_name, mode="upsert")
+
+    with pytest.raises(ValueError, match="Unsupported mode"):
+        database.copy_dataframe(df, table_name, mode="replace")
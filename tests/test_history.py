@@ -0,0 +1,105 @@
+import datetime as dt
+import os
+import polars as pl
+from nt_research.datasets.history import METADATA_FILE, scan_history, write_history
+from nt_research.storage import read_json
+
+UTC = dt.timezone.utc
+
+
+def make_history(games: list[tuple[dt.datetime, dt.datetime]]) -> pl.DataFrame:
+    # One candle per (game_start_time_utc, end_period_ts) pair
+    return pl.DataFrame(
+        {
+            "end_period_ts": [end_period_ts for _, end_period_ts in games],
+            "series_ticker": "KXNCAAFGAME",
+            "ticker": [f"T{i}" for i in range(len(games))],
+            "game_start_time_utc": [game_start for game_start, _ in games],
+            "yes_ask_close": 50,
+            "result": "yes",
+        },
+        schema_overrides={
+            "end_period_ts": pl.Datetime("us", "UTC"),
+            "game_start_time_utc": pl.Datetime("us", "UTC"),
+        },
+    )
+
+
+def test_daily_candle_after_kickoff_date(tmp_path):
+    # Evening kickoff in Denver, the daily candle closes two UTC dates later
+    game_start = dt.datetime(2025, 9, 7, 2, 30, tzinfo=UTC)
+    df = make_history([(game_start, dt.datetime(2025, 9, 8, tzinfo=UTC))])
+    write_history(df, daily=True, data_dir=str(tmp_path))
+    root = str(tmp_path / "history_daily")
+
+    assert read_json(os.path.join(root, METADATA_FILE)) == {
+        "max_candle_offset_seconds": 21.5 * 3600
+    }
+
+    lf = scan_history(start=dt.datetime(2025, 9, 8, tzinfo=UTC), source=root)
+    assert lf.collect().height == 1
+
+
+def test_bounds_prune_partitions(tmp_path):
+    games = [
+        (
+            dt.datetime(2025, 9, day, 18, tzinfo=UTC),
+            dt.datetime(2025, 9, day, 19, tzinfo=UTC),
+        )
+        for day in range(1, 11)
+    ]
+    write_history(make_history(games), data_dir=str(tmp_path))
+    root = str(tmp_path / "history")
+
+    lf = scan_history(
+        start=dt.datetime(2025, 9, 4, tzinfo=UTC),
+        end=dt.datetime(2025, 9, 6, tzinfo=UTC),
+        source=root,
+    )
+    assert lf.collect()["ticker"].to_list() == ["T3", "T4"]
+    assert "game_date" in lf.explain()
+
+
+def test_naive_bounds_are_utc(tmp_path):
+    game_start = dt.datetime(2025, 9, 6, 12, tzinfo=UTC)
+    games = [
+        (game_start, dt.datetime(2025, 9, 6, hour, tzinfo=UTC)) for hour in range(24)
+    ]
+    write_history(make_history(games), data_dir=str(tmp_path))
+    root = str(tmp_path / "history")
+
+    naive = scan_history(
+        start=dt.datetime(2025, 9, 6, 6), end=dt.datetime(2025, 9, 6, 8), source=root
+    ).collect()
+    aware = scan_history(
+        start=dt.datetime(2025, 9, 6, 6, tzinfo=UTC),
+        end=dt.datetime(2025, 9, 6, 8, tzinfo=UTC),
+        source=root,
+    ).collect()
+
+    assert naive["ticker"].to_list() == ["T6", "T7", "T8"]
+    assert naive.equals(aware)
+
+
+def test_offset_covers_partitions_written_before_it(tmp_path):
+    early = make_history(
+        [(dt.datetime(2025, 9, 1, tzinfo=UTC), dt.datetime(2025, 9, 2, 12, tzinfo=UTC))]
+    )
+    write_history(early, data_dir=str(tmp_path))
+    root = str(tmp_path / "history")
+    os.remove(os.path.join(root, METADATA_FILE))
+
+    # Without a recorded offset nothing is pruned
+    lf = scan_history(start=dt.datetime(2025, 9, 2, tzinfo=UTC), source=root)
+    assert lf.collect().height == 1
+
+    late = make_history(
+        [(dt.datetime(2025, 9, 5, tzinfo=UTC), dt.datetime(2025, 9, 5, 1, tzinfo=UTC))]
+    )
+    write_history(late, data_dir=str(tmp_path))
+
+    assert read_json(os.path.join(root, METADATA_FILE)) == {
+        "max_candle_offset_seconds": 36 * 3600
+    }
+    lf = scan_history(start=dt.datetime(2025, 9, 2, tzinfo=UTC), source=root)
+    assert lf.collect().height == 2
@@ -0,0 +1,63 @@
+import datetime as dt
+import polars as pl
+from nt_research.datasets.incremental import (
+    MAX_FAILURE_ATTEMPTS,
+    IncrementalStore,
+    MARKETS_SCHEMA,
+)
+
+GAME_START = dt.datetime(2025, 9, 6, 12, tzinfo=dt.timezone.utc)
+LOOKBACK = dt.timedelta(days=7)
+
+
+def make_markets(tickers: list[str], days_ago: int = 0) -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "series_ticker": "KXNCAAFGAME",
+            "ticker": tickers,
+            "game_start_time_utc": GAME_START - dt.timedelta(days=days_ago),
+            "result": "yes",
+        },
+        schema=MARKETS_SCHEMA,
+    )
+
+
+def test_attempts_are_counted(tmp_path):
+    store = IncrementalStore(str(tmp_path))
+    markets = make_markets(["A", "B"])
+
+    store.update_failures(markets, {"A": "timeout", "B": "timeout"})
+    store.update_failures(markets, {"A": "timeout"})
+
+    assert store.get_failures().select("ticker", "attempts").to_dicts() == [
+        {"ticker": "A", "attempts": 2}
+    ]
+
+
+def test_exhausted_failures_are_given_up(tmp_path):
+    store = IncrementalStore(str(tmp_path))
+    old = make_markets(["OLD"], days_ago=30)
+    store.append(make_markets(["DONE"]), pl.DataFrame())
+
+    store.update_failures(old, {"OLD": "404"})
+    assert store.get_min_close_ts(LOOKBACK) == old["game_start_time_utc"][0] - LOOKBACK
+    assert store.get_new_markets(old).height == 1
+
+    for _ in range(MAX_FAILURE_ATTEMPTS - 1):
+        store.update_failures(old, {"OLD": "404"})
+
+    # No longer pins the listing window or gets retried
+    assert store.get_min_close_ts(LOOKBACK) == GAME_START - LOOKBACK
+    assert store.get_new_markets(old).is_empty()
+    assert store.get_exhausted_failures()["ticker"].to_list() == ["OLD"]
+
+
+def test_failures_without_attempts(tmp_path):
+    store = IncrementalStore(str(tmp_path))
+    make_markets(["A"]).select(
+        "ticker", "game_start_time_utc", pl.lit("timeout").alias("error")
+    ).write_parquet(store.failures_path)
+
+    store.update_failures(make_markets(["A"]), {"A": "timeout"})
+
+    assert store.get_failures()["attempts"].to_list() == [2]
@@ -0,0 +1,108 @@
+import datetime as dt
+import polars as pl
+from nt_research.research.underdog_risk_premium.intraday import (
+    CANDLE_COLUMNS,
+    make_intraday_specs,
+    simulate,
+)
+
+KICKOFF = dt.datetime(2025, 9, 6, 12, tzinfo=dt.timezone.utc)
+
+
+def make_candles(tickers: dict[str, tuple[int | None, list[tuple]]]) -> pl.DataFrame:
+    # Per ticker: result and one (ask_open, ask_low, bid_open, bid_low, bid_high)
+    # tuple per minute from kickoff
+    rows = [
+        {
+            "ticker": ticker,
+            "end_period_ts": KICKOFF + dt.timedelta(minutes=minute),
+            "elapsed_time": minute,
+            **dict(zip(CANDLE_COLUMNS, candle)),
+            "result": result,
+        }
+        for ticker, (result, candles) in tickers.items()
+        for minute, candle in enumerate(candles, start=1)
+    ]
+
+    return pl.DataFrame(
+        rows,
+        schema={
+            "ticker": pl.String,
+            "end_period_ts": pl.Datetime("us", "UTC"),
+            "elapsed_time": pl.Int64,
+            **{col: pl.Float64 for col in CANDLE_COLUMNS},
+            "result": pl.Int8,
+        },
+    )
+
+
+CANDLES = make_candles(
+    {
+        # Fills at 80 on minute 2, bid reaches 95 on minute 3
+        "A": (0, [(85, 82, 80, 80, 81), (81, 79, 78, 78, 79), (90, 90, 92, 90, 95)]),
+        # Gaps through the limit at 70, stop and target in the same candle
+        "B": (1, [(70, 70, 68, 68, 69), (75, 75, 75, 40, 99)]),
+        # Fills but never settles
+        "C": (None, [(80, 80, 78, 78, 79), (80, 80, 78, 78, 79)]),
+        # Never trades through the limit
+        "D": (1, [(90, 90, 88, 88, 89)]),
+    }
+)
+
+
+def test_exits():
+    specs = make_intraday_specs(
+        entry_times=[0],
+        entry_prices=[80],
+        take_profits=[None, 95],
+        stop_losses=[None, 50],
+        entry_window=5,
+        fee_rate=0.0,
+    )
+    trades = simulate(CANDLES, specs).sort("strategy_id", "ticker")
+
+    assert trades.select(
+        "strategy_id", "ticker", "entry_price", "exit_price", "exit_reason"
+    ).rows() == [
+        (0, "A", 80.0, 0.0, "settlement"),
+        (0, "B", 70.0, 100.0, "settlement"),
+        (0, "C", 80.0, None, None),
+        (1, "A", 80.0, 0.0, "settlement"),
+        (1, "B", 70.0, 50.0, "stop_loss"),
+        (1, "C", 80.0, None, None),
+        (2, "A", 80.0, 95.0, "take_profit"),
+        (2, "B", 70.0, 95.0, "take_profit"),
+        (2, "C", 80.0, None, None),
+        (3, "A", 80.0, 95.0, "take_profit"),
+        (3, "B", 70.0, 50.0, "stop_loss"),
+        (3, "C", 80.0, None, None),
+    ]
+
+    # Unsettled trades stay in the output without a profit
+    assert trades.filter(pl.col("ticker").eq("C"))["profit"].is_null().all()
+    assert trades.filter(pl.col("ticker").ne("C"))["profit"].is_not_null().all()
+
+
+def test_entries_are_shared_across_specs():
+    specs = make_intraday_specs(
+        entry_times=[0, 1], entry_prices=[70, 80], entry_window=1, fee_rate=0.0
+    )
+    trades = simulate(CANDLES, specs)
+
+    assert trades.select("strategy_id", "ticker", "entry_ts").sort(
+        "strategy_id", "ticker"
+    ).rows() == [
+        (0, "B", KICKOFF + dt.timedelta(minutes=1)),
+        (1, "B", KICKOFF + dt.timedelta(minutes=1)),
+        (1, "C", KICKOFF + dt.timedelta(minutes=1)),
+        (3, "A", KICKOFF + dt.timedelta(minutes=2)),
+        (3, "B", KICKOFF + dt.timedelta(minutes=2)),
+        (3, "C", KICKOFF + dt.timedelta(minutes=2)),
+    ]
+
+
+def test_empty():
+    specs = make_intraday_specs(entry_times=[0], entry_prices=[1])
+
+    assert simulate(CANDLES, specs).is_empty()
+    assert simulate(CANDLES.clear(), specs).is_empty()
@@ -0,0 +1,158 @@
+import datetime as dt
+import json
+import threading
+from http.server import ThreadingHTTPServer
+import polars as pl
+import pytest
+from nt_research.benchmarks.candlesticks_decode import (
+    decode_candlesticks_dicts,
+    make_response,
+)
+from nt_research.benchmarks.candlesticks_download import CandlesticksHandler
+from nt_research.kalshi import CANDLESTICKS_SCHEMA, KalshiClient, decode_candlesticks
+
+START = dt.datetime(2025, 9, 6, tzinfo=dt.timezone.utc)
+
+
+class CountingHandler(CandlesticksHandler):
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def do_GET(self) -> None:
+        if "FAIL" in self.path:
+            self.send_error(404)
+            return
+
+        with self.lock:
+            CountingHandler.in_flight += 1
+            CountingHandler.peak = max(CountingHandler.peak, CountingHandler.in_flight)
+
+        try:
+            super().do_GET()
+        finally:
+            with self.lock:
+                CountingHandler.in_flight -= 1
+
+
+@pytest.fixture
+def client():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    CountingHandler.peak = 0
+
+    # 20 one-minute candles per request, so an hour is three windows
+    yield KalshiClient(
+        api_key_id="test",
+        private_key_pem="",
+        base_url=f"http://127.0.0.1:{server.server_port}/",
+        max_requests_per_second=1000,
+        max_candles_per_request=20,
+        max_chunk_workers=4,
+    )
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_decode_matches_dicts():
+    body = make_response(100)
+
+    df = decode_candlesticks(body, "KXNCAAFGAME", "T")
+
+    assert df.schema == pl.Schema(CANDLESTICKS_SCHEMA)
+    assert df.equals(decode_candlesticks_dicts(body, "KXNCAAFGAME", "T"))
+
+
+@pytest.mark.parametrize(
+    "response", [{"candlesticks": []}, {"candlesticks": None}, {"cursor": ""}]
+)
+def test_decode_empty(response):
+    df = decode_candlesticks(json.dumps(response).encode(), "KXNCAAFGAME", "T")
+
+    assert df.is_empty()
+    assert df.schema == pl.Schema(CANDLESTICKS_SCHEMA)
+
+
+def test_decode_nulls_and_extra_fields():
+    body = json.dumps(
+        {
+            "candlesticks": [
+                {
+                    "end_period_ts": 60,
+                    "yes_bid": {"open": None, "low": 1, "high": 2, "close": 3},
+                    "yes_ask": None,
+                    "price": {"mean": 7},
+                    "volume": 5,
+                }
+            ],
+            "ticker": "T",
+        }
+    ).encode()
+
+    row = decode_candlesticks(body, "KXNCAAFGAME", "T").row(0, named=True)
+
+    assert row == {
+        "end_period_ts": 60,
+        "yes_bid_open": None,
+        "yes_bid_low": 1,
+        "yes_bid_high": 2,
+        "yes_bid_close": 3,
+        "yes_ask_open": None,
+        "yes_ask_low": None,
+        "yes_ask_high": None,
+        "yes_ask_close": None,
+        "volume": 5,
+        "open_interest": None,
+        "series_ticker": "KXNCAAFGAME",
+        "ticker": "T",
+    }
+
+
+def make_markets(tickers: list[str]) -> list[dict]:
+    return [
+        {
+            "series_ticker": "KXNCAAFGAME",
+            "ticker": ticker,
+            "start_ts": START,
+            "end_ts": START + dt.timedelta(hours=1),
+        }
+        for ticker in tickers
+    ]
+
+
+def test_market_windows_are_combined(client):
+    df = client.get_market_candlesticks(
+        "KXNCAAFGAME", "A", START, START + dt.timedelta(hours=1), period_interval=1
+    )
+
+    expected = pl.int_range(
+        int(START.timestamp()) + 60, int(START.timestamp()) + 3601, 60, eager=True
+    )
+    assert df.schema == pl.Schema(CANDLESTICKS_SCHEMA)
+    assert df["end_period_ts"].to_list() == expected.to_list()
+
+
+def test_windows_share_one_pool(client):
+    markets = make_markets(["A", "B", "C", "D"])
+
+    serial, _ = client.get_markets_candlesticks(markets, period_interval=1)
+    candlesticks, failures = client.get_markets_candlesticks(
+        markets, period_interval=1, max_workers=4
+    )
+
+    assert failures == {}
+    assert candlesticks.equals(serial)
+    assert candlesticks.height == 4 * 60
+    assert CountingHandler.peak <= 4
+
+
+def test_market_with_a_failed_window_fails(client):
+    markets = make_markets(["A", "FAIL", "B"])
+
+    candlesticks, failures = client.get_markets_candlesticks(
+        markets, period_interval=1, max_workers=4
+    )
+
+    assert list(failures) == ["FAIL"]
+    assert candlesticks["ticker"].unique(maintain_order=True).to_list() == ["A", "B"]
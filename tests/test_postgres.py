@@ -0,0 +1,99 @@
+import datetime as dt
+import polars as pl
+import pytest
+from nt_research.database import execute_query
+from nt_research.datasets.postgres import (
+    CANDLESTICKS_COLUMNS,
+    create_partitions,
+    load_history,
+)
+
+UTC = dt.timezone.utc
+
+
+def make_history(yes_ask_close: int = 50) -> pl.DataFrame:
+    # Two games, one with candles on both sides of a month boundary
+    games = {
+        "A": dt.datetime(2025, 9, 30, 23, tzinfo=UTC),
+        "B": dt.datetime(2025, 10, 4, 18, tzinfo=UTC),
+    }
+    rows = [
+        {
+            "ticker": ticker,
+            "series_ticker": "KXNCAAFGAME",
+            "end_period_ts": game_start + dt.timedelta(minutes=minute),
+            **{
+                col: yes_ask_close
+                for col in CANDLESTICKS_COLUMNS
+                if col.startswith("yes_") or col in ("volume", "open_interest")
+            },
+            "game_start_time_utc": game_start,
+            "result": "yes",
+        }
+        for ticker, game_start in games.items()
+        for minute in range(0, 120, 10)
+    ]
+
+    return pl.DataFrame(rows).with_columns(
+        pl.col("end_period_ts", "game_start_time_utc").dt.cast_time_unit("us")
+    )
+
+
+def get_partitions(table_name: str) -> list[str]:
+    rows = execute_query(
+        """
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = %s::regclass
+        ORDER BY c.relname
+        """,
+        (table_name,),
+    )
+    return [row["relname"] for row in rows]
+
+
+@pytest.mark.parametrize("daily", [False, True])
+def test_load_history(database_schema, daily):
+    table_name = "candlesticks_daily" if daily else "candlesticks"
+    history = make_history()
+
+    assert load_history(history, daily=daily) == (2, history.height)
+
+    assert get_partitions(table_name) == [
+        f"{table_name}_2025_09",
+        f"{table_name}_2025_10",
+    ]
+    assert execute_query(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname = %s",
+        (table_name, f"{table_name}_end_period_ts_brin"),
+    )[0]["indexdef"].endswith("USING brin (end_period_ts)")
+
+    # Reloading upserts onto the primary keys instead of duplicating rows
+    load_history(make_history(yes_ask_close=60).lazy(), daily=daily)
+
+    counts = execute_query(
+        f"""
+        SELECT
+            (SELECT count(*) FROM markets) AS markets,
+            count(*) AS candlesticks,
+            count(*) FILTER (WHERE yes_ask_close = 60) AS updated
+        FROM {table_name}
+        """
+    )
+    assert counts == [
+        {"markets": 2, "candlesticks": history.height, "updated": history.height}
+    ]
+
+
+def test_december_partition(database_schema):
+    load_history(make_history())
+    create_partitions([dt.date(2025, 12, 1)])
+
+    (row,) = execute_query(
+        "SELECT pg_get_expr(relpartbound, oid) AS bound FROM pg_class "
+        "WHERE relname = 'candlesticks_2025_12'"
+    )
+    assert row["bound"] == (
+        "FOR VALUES FROM ('2025-12-01 00:00:00+00') TO ('2026-01-01 00:00:00+00')"
+    )
@@ -0,0 +1,34 @@
+import types
+import polars as pl
+from nt_research.rendering import get_render_key
+from nt_research.research.underdog_risk_premium.experiment_1 import (
+    create_calibration_chart,
+)
+
+
+def as_main(function: types.FunctionType) -> types.FunctionType:
+    # What the function looks like when its module runs as a script
+    copy = types.FunctionType(
+        function.__code__, function.__globals__, function.__name__
+    )
+    copy.__qualname__ = function.__qualname__
+    copy.__module__ = "__main__"
+    return copy
+
+
+def test_render_key_matches_between_script_and_import():
+    kwargs = dict(results=pl.DataFrame({"x": [1, 2]}), title="t", file_name="a.png")
+
+    assert get_render_key(create_calibration_chart, kwargs) == get_render_key(
+        as_main(create_calibration_chart), kwargs
+    )
+
+
+def test_render_key_ignores_file_name_but_not_inputs():
+    kwargs = dict(results=pl.DataFrame({"x": [1, 2]}), title="t", file_name="a.png")
+    key = get_render_key(create_calibration_chart, kwargs)
+
+    assert key == get_render_key(
+        create_calibration_chart, {**kwargs, "file_name": "b.png"}
+    )
+    assert key != get_render_key(create_calibration_chart, {**kwargs, "title": "u"})
@@ -0,0 +1,25 @@
+import polars as pl
+from nt_research.benchmarks.get_trades import make_history
+from nt_research.research.underdog_risk_premium.sweep import RESULTS_SCHEMA, run_sweep
+
+
+def test_empty_grid():
+    results = run_sweep(time_intervals=[], price_break_sets=[[0, 50, 99]])
+
+    assert results.is_empty()
+    assert results.schema == pl.Schema(RESULTS_SCHEMA)
+
+
+def test_results_schema(tmp_path):
+    source = str(tmp_path / "history.parquet")
+    make_history(source, n_tickers=5)
+
+    results = run_sweep(
+        time_intervals=[60],
+        price_break_sets=[[0, 50, 99]],
+        source=source,
+        max_workers=1,
+    )
+
+    assert results.height > 0
+    assert results.schema == pl.Schema(RESULTS_SCHEMA)
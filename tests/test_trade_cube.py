@@ -0,0 +1,72 @@
+import datetime as dt
+import os
+import shutil
+import polars as pl
+import pytest
+import nt_research.research.underdog_risk_premium.data_utils as du
+from nt_research.benchmarks.get_trades import get_trades_eager, make_history
+
+PARAMS = {"min_elapsed_time": -180, "max_elapsed_time": 180, "time_interval": 60}
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    monkeypatch.setattr(du, "TRADE_CUBE_DIR", str(tmp_path / "cube"))
+    path = str(tmp_path / "history.parquet")
+    make_history(path, n_tickers=20)
+    return path
+
+
+def sort_trades(df: pl.DataFrame) -> pl.DataFrame:
+    return df.select(sorted(df.columns)).sort("ticker", "time_bin", "price_bin")
+
+
+@pytest.mark.parametrize(
+    "bins",
+    [{}, {"time_bin": "(-60, 0]"}, {"time_bin": "(0, 60]", "price_bin": "(40, 50]"}],
+)
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_matches_eager(source, bins, use_cache):
+    expected = get_trades_eager(source, **PARAMS, **bins)
+    trades = du.get_trades(**PARAMS, **bins, source=source, use_cache=use_cache)
+
+    assert expected.height > 0
+    assert sort_trades(trades).equals(
+        sort_trades(expected).cast(dict(trades.schema))
+    )
+
+
+def test_cache_is_reused(source):
+    first = du.get_trades(**PARAMS, source=source)
+    assert len(os.listdir(du.TRADE_CUBE_DIR)) == 1
+
+    assert du.get_trades(**PARAMS, source=source).equals(first)
+    assert len(os.listdir(du.TRADE_CUBE_DIR)) == 1
+
+
+def test_sources_keep_their_own_cubes(source, tmp_path):
+    other = str(tmp_path / "other.parquet")
+    shutil.copy(source, other)
+
+    du.get_trades(**PARAMS, source=source)
+    du.get_trades(**PARAMS, source=other)
+    assert len(os.listdir(du.TRADE_CUBE_DIR)) == 2
+
+    # Rewriting one source only replaces its own cube
+    make_history(other, n_tickers=5)
+    du.get_trades(**PARAMS, source=other)
+    assert len(os.listdir(du.TRADE_CUBE_DIR)) == 2
+
+
+def test_bounds_match_eager(source, tmp_path):
+    start = dt.datetime(2025, 9, 6, 12, tzinfo=dt.timezone.utc)
+    bounded = str(tmp_path / "bounded.parquet")
+    pl.read_parquet(source).filter(pl.col("end_period_ts").ge(start)).write_parquet(
+        bounded
+    )
+
+    expected = get_trades_eager(bounded, **PARAMS)
+    trades = du.get_trades(**PARAMS, source=source, start=start)
+
+    assert expected["elapsed_time"].min() == 0
+    assert sort_trades(trades).equals(sort_trades(expected).cast(dict(trades.schema)))